@@ -16,7 +16,6 @@ from frontend.components import (
 )
 from frontend.utils.api_client import APIClient
 from config.languages import LANGUAGES, get_translation
-from backend.services.hospital_locator import HospitalLocator
 
 # Page configuration
 st.set_page_config(
@@ -98,8 +97,9 @@ def main():
         ["📸 Analyze Image", "🗣️ Voice Input", "🏥 Find Doctor", "🚨 Emergency Mode", "📚 Education", "ℹ️ About"]
     )
     
-    # Check backend connectivity
-    if not st.session_state.api_client.health_check():
+    # Check backend connectivity (last known state, refreshed in the background)
+    health_monitor = st.session_state.api_client.health_monitor
+    if not health_monitor.is_healthy:
         st.error("""
         ⚠️ **Backend Connection Error**
         
@@ -108,6 +108,11 @@ def main():
         python -m backend.main
         ```
         """)
+        if health_monitor.age is not None:
+            st.caption(f"Last checked {health_monitor.age:.0f}s ago: {health_monitor.last_error}")
+        resilience = st.session_state.api_client.resilience_stats()
+        if resilience["state"] == "open":
+            st.caption(f"Backend requests paused for {resilience['retry_in']:.0f}s after repeated failures")
         return
     
     if page == "📸 Analyze Image":
@@ -142,8 +147,8 @@ def analyze_image_page():
             # Display uploaded image
             upload_box.display_uploaded_image(uploaded_file)
             
-            # Save file
-            image_path = upload_box.save_uploaded_file(uploaded_file)
+            # Save file (once per distinct upload)
+            image_path = upload_box.get_saved_upload_path(uploaded_file)
             
             # Step 2: Patient Information
             st.markdown("### Step 2: Patient Information")
@@ -155,16 +160,35 @@ def analyze_image_page():
             if st.button("🔍 Analyze Image", width='stretch', type="primary"):
                 with st.spinner("Analyzing image... This may take a moment..."):
                     try:
+                        upload_progress = st.progress(0, text="Uploading image...")
+                        shown = [-1]
+                        
+                        def on_upload_progress(sent, total):
+                            # Redraw only when the whole percentage changes
+                            percent = sent * 100 // max(total, 1)
+                            if percent != shown[0]:
+                                shown[0] = percent
+                                upload_progress.progress(percent, text=f"Uploading image... {percent}%")
+                        
                         result = st.session_state.api_client.upload_image(
                             image_path,
-                            age_group=medical_info["age_group"]
+                            age_group=medical_info["age_group"],
+                            on_progress=on_upload_progress
                         )
+                        upload_progress.empty()
                         
                         if "error" in result:
                             st.error(f"Analysis Error: {result['error']}")
                         else:
                             st.session_state.analysis_result = result
                             st.success("✅ Analysis Complete!")
+                            
+                            upload = result.get("upload", {})
+                            if upload.get("sent_bytes", 0) < upload.get("original_bytes", 0):
+                                st.caption(
+                                    f"Uploaded {upload['sent_bytes'] / 1024:.0f} KB "
+                                    f"(resized from {upload['original_bytes'] / 1024:.0f} KB)"
+                                )
                     
                     except Exception as e:
                         st.error(f"Error: {str(e)}")
@@ -301,6 +325,26 @@ def voice_input_page():
             
             st.success("✅ Voice input received and analyzed!")
             
+            # Ensure severity has a valid value
+            injury_type = voice_data.get("injury_type", get_text('unknown'))
+            severity = voice_data.get("severity") or "Moderate"
+            affected_area = voice_data.get("body_area")
+            
+            # Fetch first aid and emergency guidance in one round trip
+            with st.spinner(get_text('getting_guidance')):
+                print(f"[DEBUG] Requesting guidance: injury_type={injury_type}, severity={severity}, area={affected_area}")
+                
+                bundle = st.session_state.api_client.get_guidance_batch(
+                    injury_type=injury_type,
+                    severity=severity,
+                    affected_area=affected_area,
+                    include_emergency=bool(voice_data.get("is_emergency"))
+                )
+                guidance = bundle.first_aid
+                emergency_guidance = bundle.emergency or {}
+                
+                print(f"[DEBUG] Guidance response: {guidance}")
+            
             st.markdown("---")
             st.markdown("### 📋 Injury Information")
             
@@ -313,11 +357,9 @@ def voice_input_page():
                         st.error(get_text('please_call_911'))
                 with col_emergency2:
                     if st.button(get_text('get_emergency_guidance'), width='stretch'):
-                        injury_type = voice_data.get("injury_type", get_text('unknown'))
-                        guidance = st.session_state.api_client.get_emergency_guidance(injury_type)
-                        if "data" in guidance:
+                        if "data" in emergency_guidance:
                             st.info(f"📋 {get_text('emergency_guidance')}:")
-                            for step in guidance["data"].get("steps", []):
+                            for step in emergency_guidance["data"].get("steps", []):
                                 st.write(f"• {step}")
             
             # Show analysis
@@ -337,59 +379,43 @@ def voice_input_page():
             st.markdown("---")
             st.markdown(f"### {get_text('first_aid_guidance')}")
             
-            with st.spinner(get_text('getting_guidance')):
-                # Ensure severity has a valid value
-                injury_type = voice_data.get("injury_type", get_text('unknown'))
-                severity = voice_data.get("severity") or "Moderate"
-                affected_area = voice_data.get("body_area")
-                
-                print(f"[DEBUG] Requesting guidance: injury_type={injury_type}, severity={severity}, area={affected_area}")
-                
-                guidance = st.session_state.api_client.get_first_aid_guidance(
-                    injury_type=injury_type,
-                    severity=severity,
-                    affected_area=affected_area
-                )
-                
-                print(f"[DEBUG] Guidance response: {guidance}")
-                
-                # Check for errors in response
-                if isinstance(guidance, dict):
-                    if "error" in guidance or guidance.get("status") == "error":
-                        error_msg = get_text('unknown')
-                        if isinstance(guidance.get("error"), dict):
-                            error_msg = guidance.get("error", {}).get("message", get_text('unknown'))
-                        elif isinstance(guidance.get("error"), str):
-                            error_msg = guidance.get("error")
-                        st.error(f"{get_text('error_getting_guidance')}: {error_msg}")
-                    elif "data" in guidance:
-                        data = guidance["data"]
-                        
-                        # Display first aid steps
-                        if "first_aid_steps" in data and data["first_aid_steps"]:
-                            st.markdown(f"#### {get_text('steps_follow')}")
-                            for step in data["first_aid_steps"]:
-                                # Handle both dict and string formats
-                                if isinstance(step, dict):
-                                    st.markdown(f"**{get_text('step')} {step.get('order', '?')}:** {step.get('title', '')}")
-                                    st.write(step.get('description', ''))
-                                    if step.get('warning'):
-                                        st.warning(f"{get_text('warning')} {step.get('warning')}")
-                                    if step.get('duration'):
-                                        st.caption(f"{get_text('duration')}: {step.get('duration')}")
-                                else:
-                                    st.markdown(f"• {step}")
-                            st.markdown("")
-                        else:
-                            st.warning(get_text('no_steps_available'))
-                        
-                        # Display professional help recommendation
-                        if "professional_help" in data and data["professional_help"]:
-                            st.info(f"{get_text('professional_help')}\n{data['professional_help']}")
+            # Check for errors in response
+            if isinstance(guidance, dict):
+                if "error" in guidance or guidance.get("status") == "error":
+                    error_msg = get_text('unknown')
+                    if isinstance(guidance.get("error"), dict):
+                        error_msg = guidance.get("error", {}).get("message", get_text('unknown'))
+                    elif isinstance(guidance.get("error"), str):
+                        error_msg = guidance.get("error")
+                    st.error(f"{get_text('error_getting_guidance')}: {error_msg}")
+                elif "data" in guidance:
+                    data = guidance["data"]
+                    
+                    # Display first aid steps
+                    if "first_aid_steps" in data and data["first_aid_steps"]:
+                        st.markdown(f"#### {get_text('steps_follow')}")
+                        for step in data["first_aid_steps"]:
+                            # Handle both dict and string formats
+                            if isinstance(step, dict):
+                                st.markdown(f"**{get_text('step')} {step.get('order', '?')}:** {step.get('title', '')}")
+                                st.write(step.get('description', ''))
+                                if step.get('warning'):
+                                    st.warning(f"{get_text('warning')} {step.get('warning')}")
+                                if step.get('duration'):
+                                    st.caption(f"{get_text('duration')}: {step.get('duration')}")
+                            else:
+                                st.markdown(f"• {step}")
+                        st.markdown("")
                     else:
-                        st.error(get_text('unexpected_format'))
+                        st.warning(get_text('no_steps_available'))
+                    
+                    # Display professional help recommendation
+                    if "professional_help" in data and data["professional_help"]:
+                        st.info(f"{get_text('professional_help')}\n{data['professional_help']}")
                 else:
-                    st.error(f"{get_text('error_getting_guidance')}: {guidance}")
+                    st.error(get_text('unexpected_format'))
+            else:
+                st.error(f"{get_text('error_getting_guidance')}: {guidance}")
             
             # Show nearby hospitals
             st.markdown("---")
@@ -421,10 +447,11 @@ def voice_input_page():
             )
             
             if text_desc:
-                injury_type = voice_input.extract_injury_type(text_desc)
-                severity = voice_input.extract_severity(text_desc)
-                is_emergency = voice_input.detect_emergency(text_desc)
-                body_area = voice_input.extract_body_area(text_desc)
+                analysis = voice_input.analyze_injury_text(text_desc)
+                injury_type = analysis["injury_type"]
+                severity = analysis["severity"]
+                is_emergency = analysis["is_emergency"]
+                body_area = analysis["body_area"]
                 
                 st.markdown("---")
                 st.markdown("### 📋 Analysis")
@@ -507,6 +534,8 @@ def find_doctor_page():
         st.session_state.doctor_search_address = None
     if "doctor_search_radius" not in st.session_state:
         st.session_state.doctor_search_radius = 5
+    if "doctor_search_results" not in st.session_state:
+        st.session_state.doctor_search_results = None
     
     # Form for doctor search
     with st.form("find_doctor_form", clear_on_submit=True):
@@ -534,95 +563,50 @@ def find_doctor_page():
         if submitted and address:
             st.session_state.doctor_search_address = address
             st.session_state.doctor_search_radius = radius
+            st.session_state.doctor_search_results = None
+            st.session_state.doctor_page = 1
     
     # Display results if search was performed
     if st.session_state.doctor_search_address:
-        with st.spinner(get_text('finding_hospitals')):
-            try:
-                locator = HospitalLocator()
-                
-                # Get coordinates from address
-                coords = locator.get_address_coordinates(st.session_state.doctor_search_address)
-                if coords:
-                    lat, lon = coords
-                    
-                    # Get hospitals/clinics near the location
-                    hospitals = locator.get_hospitals_near_location(lat, lon, radius_km=st.session_state.doctor_search_radius)
-                    
-                    if hospitals:
-                        st.markdown(f"### 🏥 {get_text('nearby_facilities')}")
-                        st.markdown(f"✅ {get_text('hospitals_found')} **{len(hospitals)}** {get_text('facilities')}:")
-                        
-                        # Display doctors/specialists
-                        for idx, hospital in enumerate(hospitals, 1):
-                            with st.expander(
-                                f"**{idx}. {hospital.get('name', get_text('unknown'))}** - {hospital.get('distance_km', 'N/A')} {get_text('km_away')}",
-                                expanded=(idx == 1)
-                            ):
-                                col1, col2 = st.columns([2, 1])
-                                
-                                with col1:
-                                    if hospital.get('type'):
-                                        st.markdown(f"**{get_text('hospital_type')}:** {hospital.get('type')}")
-                                    st.markdown(f"**{get_text('hospital_distance')}:** {hospital.get('distance_km', 'N/A')} km")
-                                    
-                                    if hospital.get('phone'):
-                                        st.markdown(f"**{get_text('hospital_phone')}** {hospital.get('phone')}")
-                                    
-                                    if hospital.get('opening_hours'):
-                                        st.markdown(f"**{get_text('hospital_hours')}** {hospital.get('opening_hours')}")
-                                    
-                                    if hospital.get('operator'):
-                                        st.markdown(f"**{get_text('hospital_organization')}:** {hospital.get('operator')}")
-                                    
-                                    if hospital.get('website'):
-                                        st.markdown(f"**{get_text('hospital_website')}** [{hospital.get('website')}]({hospital.get('website')})")
-                                
-                                with col2:
-                                    col_map, col_nav = st.columns(2)
-                                    
-                                    with col_map:
-                                        if st.button(
-                                            get_text('hospital_map'),
-                                            key=f"doc_map_{idx}",
-                                            width='stretch'
-                                        ):
-                                            st.write(f"[Open in Google Maps]({hospital.get('google_maps_url')})")
-                                    
-                                    with col_nav:
-                                        if st.button(
-                                            get_text('hospital_navigate'),
-                                            key=f"doc_nav_{idx}",
-                                            width='stretch'
-                                        ):
-                                            st.write(f"[Open Navigation]({hospital.get('osm_url', hospital.get('google_maps_url'))})")
+        try:
+            # Search once per address/radius; paging through the results reruns
+            # the page without repeating the search
+            if st.session_state.doctor_search_results is None:
+                with st.spinner(get_text('finding_hospitals')):
+                    coords = hospital_locator.geocode_address(st.session_state.doctor_search_address)
+                    if coords:
+                        lat, lon = coords
                         
-                        # Show map
-                        st.markdown("---")
-                        st.markdown(f"### {get_text('hospital_map')}")
-                        map_data = []
-                        for hospital in hospitals:
-                            if hospital.get("latitude") and hospital.get("longitude"):
-                                map_data.append({
-                                    "latitude": float(hospital.get("latitude")),
-                                    "longitude": float(hospital.get("longitude")),
-                                })
-                        
-                        if map_data:
-                            st.map(map_data, zoom=12, use_container_width=True)
-                            st.caption("🔴 Red pins show doctor/specialist locations")
-                    else:
-                        st.warning(get_text('no_hospitals_found'))
-                else:
-                    st.error(f"Could not find coordinates for address: {st.session_state.doctor_search_address}")
-                    
-            except Exception as e:
-                st.error(f"Error finding doctors: {str(e)}")
+                        # Get hospitals/clinics near the location
+                        st.session_state.doctor_search_results = hospital_locator.search_facilities(
+                            lat, lon, st.session_state.doctor_search_radius
+                        )
+            
+            hospitals = st.session_state.doctor_search_results
+            if hospitals is None:
+                st.error(f"Could not find coordinates for address: {st.session_state.doctor_search_address}")
+            elif hospitals:
+                hospital_locator.display_hospitals(hospitals, key_prefix="doctor")
+                
+                # Show map
+                st.markdown("---")
+                st.markdown(f"### {get_text('hospital_map')}")
+                hospital_locator.display_hospital_map(
+                    hospitals,
+                    key_prefix="doctor",
+                    caption="🔴 Red pins show doctor/specialist locations"
+                )
+            else:
+                st.warning(get_text('no_hospitals_found'))
+                
+        except Exception as e:
+            st.error(f"Error finding doctors: {str(e)}")
         
         # Clear search button
         if st.button("🔄 New Search"):
             st.session_state.doctor_search_address = None
             st.session_state.doctor_search_radius = 5
+            st.session_state.doctor_search_results = None
             st.rerun()
 
 
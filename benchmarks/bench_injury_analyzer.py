@@ -0,0 +1,125 @@
+"""
+Micro-benchmark: single-pass injury analyzer vs the original four keyword scans
+
+Run from the project root:
+    python frontend/benchmarks/bench_injury_analyzer.py
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from frontend.utils.injury_analyzer import (
+    INJURY_KEYWORDS, SEVERITY_KEYWORDS, BODY_AREAS, EMERGENCY_KEYWORDS,
+    InjuryTextAnalyzer, analyze_injury_text, ahocorasick
+)
+
+
+def legacy_analyze(text: str) -> dict:
+    """The four separate scans voice_input used before the analyzer"""
+    def injury_type():
+        if not text:
+            return "General Injury"
+        text_lower = text.lower()
+        for injury, keywords in INJURY_KEYWORDS.items():
+            for keyword in keywords:
+                if keyword in text_lower:
+                    return injury
+        return "General Injury"
+
+    def severity():
+        if not text:
+            return "Moderate"
+        text_lower = text.lower()
+        for level, keywords in SEVERITY_KEYWORDS.items():
+            if any(word in text_lower for word in keywords):
+                return level
+        return "Moderate"
+
+    def emergency():
+        if not text:
+            return False
+        text_lower = text.lower()
+        return any(keyword in text_lower for keyword in EMERGENCY_KEYWORDS)
+
+    def body_area():
+        if not text:
+            return None
+        text_lower = text.lower()
+        for area in BODY_AREAS:
+            if area in text_lower:
+                return area.capitalize()
+        return None
+
+    return {
+        "injury_type": injury_type(),
+        "severity": severity(),
+        "is_emergency": emergency(),
+        "body_area": body_area(),
+    }
+
+
+FILLER = (
+    "so I was walking down the street yesterday evening when something "
+    "happened that I did not expect at all and now I am writing this down"
+).split()
+
+SENTENCES = [
+    "I burned my hand on the stove about 5 minutes ago. It's red and hurts a lot.",
+    "My son fell off his bike and I think his wrist is broken, it looks very bad",
+    "She is choking and can't breathe, please help",
+    "there is a small cut on my finger",
+    "He hit head on the door and feels weak and pale",
+    "Severe bleeding from the leg, it's gushing",
+    "I swallowed something toxic, feeling slightly dizzy",
+    "allergic reaction with a rash on my face and eyes swelling",
+    "",
+    "nothing to report",
+]
+
+
+def build_transcript(words: int, seed: int = 0) -> str:
+    """Build a long transcript of filler words with one injury sentence at the end"""
+    rng = random.Random(seed)
+    return " ".join(rng.choice(FILLER) for _ in range(words)) + " " + SENTENCES[1]
+
+
+def best_of(func, text: str, number: int) -> float:
+    """Best average time of one call, in milliseconds"""
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=5)) / number * 1e3
+
+
+def main():
+    analyzers = {"regex": InjuryTextAnalyzer(use_automaton=False)}
+    if ahocorasick is not None:
+        analyzers["automaton"] = InjuryTextAnalyzer()
+    else:
+        print("pyahocorasick not installed; only the regex fallback is measured")
+
+    for sentence in SENTENCES:
+        for analyzer in analyzers.values():
+            assert analyzer.analyze(sentence) == legacy_analyze(sentence), sentence
+
+    columns = ["legacy"] + list(analyzers) + ["memoized"]
+    print(f"{'words':>8} {'chars':>8} " + " ".join(f"{name + ' ms':>14}" for name in columns))
+    for words in (50, 500, 2000, 10000):
+        text = build_transcript(words)
+        number = max(1, 20000 // words)
+
+        timings = [best_of(legacy_analyze, text, number)]
+        for analyzer in analyzers.values():
+            assert analyzer.analyze(text) == legacy_analyze(text)
+            timings.append(best_of(analyzer.analyze, text, number))
+        analyze_injury_text(text)
+        timings.append(best_of(analyze_injury_text, text, number))
+
+        cells = [f"{timings[0]:>14.3f}"] + [
+            f"{t:>7.3f} ({timings[0] / t:>4.1f}x)" for t in timings[1:]
+        ]
+        print(f"{words:>8} {len(text):>8} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
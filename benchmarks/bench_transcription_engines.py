@@ -0,0 +1,137 @@
+"""
+Offline check and timing of the transcription engine registry
+
+Needs no network and no speech model. A stub engine registered through
+``register_engine`` exercises the registry, the shared instances, silence
+trimming, in-order stitching of concurrently transcribed segments and
+in-memory WAV, AIFF and FLAC uploads. The
+offline engines (Vosk, PocketSphinx) are then loaded and timed if their
+optional packages and models are installed, and skipped otherwise.
+
+Run from the project root:
+    python frontend/benchmarks/bench_transcription_engines.py [speech.wav]
+
+Without a WAV file the offline engines get a synthetic tone clip, which
+they should report as not understood.
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import numpy as np
+import speech_recognition as sr
+
+from frontend.components.voice_input import (
+    TRANSCRIPTION_ENGINES, TranscriptionEngine, available_engines, get_transcription_engine,
+    open_audio_buffer, register_engine, split_speech, transcribe_clips
+)
+
+SAMPLE_RATE = 16000
+
+
+@register_engine
+class ClipLengthEngine(TranscriptionEngine):
+    """Offline stub that "transcribes" a clip as its length in tenths of a second"""
+
+    name = "clip-length"
+    label = "Clip length (stub)"
+
+    def transcribe(self, audio_data) -> str:
+        samples = len(audio_data.get_raw_data()) // audio_data.sample_width
+        return f"{round(samples / audio_data.sample_rate * 10)}"
+
+
+def build_clip(pattern) -> sr.AudioData:
+    """Build 16-bit mono audio from (seconds, amplitude) pairs of 220 Hz tone"""
+    rng = np.random.default_rng(0)
+    parts = []
+    for seconds, amplitude in pattern:
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        parts.append(amplitude * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 20, t.size))
+    samples = np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+    return sr.AudioData(samples.tobytes(), SAMPLE_RATE, 2)
+
+
+def check_registry():
+    offered = available_engines()
+    assert ClipLengthEngine.name in offered
+    print(f"offered engines: {', '.join(offered)}")
+
+    engine = get_transcription_engine(ClipLengthEngine.name)
+    assert engine is get_transcription_engine(ClipLengthEngine.name), "engines must be shared"
+
+    # Three 1 s bursts separated by 2 s pauses: silence is trimmed and the
+    # segment texts come back in recording order
+    bursts = build_clip([(1, 2500), (2, 0), (1, 2500), (2, 0), (1, 2500)])
+    clips, trimmed = split_speech(bursts)
+    assert trimmed > 2, trimmed
+    print(f"bursts: {len(clips)} clip(s), {trimmed:.1f}s trimmed -> {transcribe_clips(engine, clips)!r}")
+
+    # Continuous speech has no silence to cut and must reach the engine whole
+    continuous = build_clip([(2.5, amplitude) for amplitude in (2500, 1800, 3000, 2200)])
+    clips, trimmed = split_speech(continuous)
+    assert clips == [continuous] and trimmed == 0
+    print(f"continuous: untrimmed -> {transcribe_clips(engine, clips)!r}")
+
+
+def check_audio_buffers():
+    engine = get_transcription_engine(ClipLengthEngine.name)
+    clip = build_clip([(1.5, 2500)])
+    expected = np.frombuffer(clip.get_raw_data(), np.int16)
+    uploads = {
+        "wav": clip.get_wav_data(),
+        "aiff": clip.get_aiff_data(),
+        "flac": clip.get_flac_data(),
+    }
+    for audio_format, data in uploads.items():
+        with open_audio_buffer(data) as source:
+            decoded = sr.Recognizer().record(source)
+        assert decoded.sample_rate == SAMPLE_RATE, audio_format
+        assert np.array_equal(np.frombuffer(decoded.get_raw_data(), np.int16), expected), audio_format
+        print(f"{audio_format} upload: {len(data)} bytes -> {transcribe_clips(engine, [decoded])!r}")
+
+
+def time_offline_engines(clip: sr.AudioData):
+    duration = len(clip.get_raw_data()) / clip.sample_width / clip.sample_rate
+    for name in ("vosk", "sphinx"):
+        if name not in TRANSCRIPTION_ENGINES:
+            continue
+        if not TRANSCRIPTION_ENGINES[name].is_available():
+            print(f"{name}: skipped (not installed)")
+            continue
+        try:
+            start = time.perf_counter()
+            engine = get_transcription_engine(name)
+            loaded = time.perf_counter() - start
+        except RuntimeError as e:
+            print(f"{name}: skipped ({e.__cause__ or e})")
+            continue
+
+        start = time.perf_counter()
+        try:
+            text = repr(engine.transcribe(clip))
+        except sr.UnknownValueError:
+            text = "not understood"
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name}: load {loaded:.2f}s, {duration:.1f}s of audio in {elapsed:.2f}s "
+            f"({duration / elapsed:.1f}x real time) -> {text}"
+        )
+
+
+def main():
+    check_registry()
+    check_audio_buffers()
+
+    if len(sys.argv) > 1:
+        with sr.AudioFile(sys.argv[1]) as source:
+            clip = sr.Recognizer().record(source)
+    else:
+        clip = build_clip([(3, 2500)])
+    time_offline_engines(clip)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,41 @@
 """
 Hospital Locator Component - Display nearby hospitals and medical facilities
 """
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import numpy as np
 import streamlit as st
 from config.languages import get_translation
 from backend.services.hospital_locator import HospitalLocator
+from frontend.utils.facility_index import get_facility_index
+from frontend.utils.geocode_cache import get_geocode_cache
+from frontend.utils.geo import cluster_points, coordinate_arrays, pixel_metres, rank_facilities
+
+# Locator instances shared by all sessions; at most this many lookups run at once
+HOSPITAL_LOCATOR_POOL_SIZE = int(os.getenv("HOSPITAL_LOCATOR_POOL_SIZE", "8"))
+
+# Result list page sizes offered to the user; the first is the default
+HOSPITAL_PAGE_SIZES = (10, 25, 50)
+
+# Map zoom levels offered to the user and the default
+HOSPITAL_MAP_ZOOMS = (9, 10, 11, 12, 13, 14, 15)
+HOSPITAL_MAP_ZOOM = 12
+
+# Points closer than this many screen pixels are merged into one map marker
+MAP_CLUSTER_CELL_PX = float(os.getenv("MAP_CLUSTER_CELL_PX", "40"))
+
+# Screen radius of a single-facility marker, in pixels
+MAP_MARKER_PX = 4
+
+# HospitalLocator does not document thread safety, so each instance is
+# used by one thread at a time and concurrent sessions borrow from a pool
+_locator_pool: "queue.LifoQueue[HospitalLocator]" = queue.LifoQueue()
+_locators_created = 0
+_locator_pool_lock = threading.Lock()
 
 
 def get_text(key: str) -> str:
@@ -12,6 +44,92 @@ def get_text(key: str) -> str:
     return get_translation(language, key)
 
 
+@contextmanager
+def borrow_hospital_locator() -> Iterator[HospitalLocator]:
+    """
+    Borrow a hospital locator from the process-wide pool
+    
+    Locators are created on demand up to HOSPITAL_LOCATOR_POOL_SIZE; once
+    that many are busy, callers wait for one to be returned. No lock is
+    held while the locator is in use, so lookups from different sessions
+    run concurrently and each locator keeps its own connections warm.
+    
+    Yields:
+        HospitalLocator instance owned by the caller until the block exits
+    """
+    global _locators_created
+    try:
+        locator = _locator_pool.get_nowait()
+    except queue.Empty:
+        with _locator_pool_lock:
+            create = _locators_created < HOSPITAL_LOCATOR_POOL_SIZE
+            if create:
+                _locators_created += 1
+        if create:
+            try:
+                locator = HospitalLocator()
+            except BaseException:
+                with _locator_pool_lock:
+                    _locators_created -= 1
+                raise
+        else:
+            locator = _locator_pool.get()
+    try:
+        yield locator
+    finally:
+        _locator_pool.put(locator)
+
+
+def geocode_address(address: str):
+    """
+    Get coordinates for an address, using the shared geocode cache
+    
+    Args:
+        address: Address or postcode entered by the user
+    
+    Returns:
+        (latitude, longitude) or None if the address could not be found
+    """
+    cache = get_geocode_cache()
+    coords = cache.get(address)
+    if coords is None:
+        with borrow_hospital_locator() as locator:
+            coords = locator.get_address_coordinates(address)
+        if coords:
+            cache.set(address, coords)
+    return coords
+
+
+def search_facilities(
+    lat: float,
+    lon: float,
+    radius_km: float,
+    top_k: Optional[int] = None
+) -> list:
+    """
+    Find medical facilities around a point
+    
+    Answers from the local facility index when FACILITY_DATA_PATH is set,
+    otherwise asks a pooled hospital locator's remote source and ranks
+    its results by distance in one vectorized pass.
+    
+    Args:
+        lat: Search centre latitude
+        lon: Search centre longitude
+        radius_km: Search radius in kilometres
+        top_k: Return at most this many facilities
+    
+    Returns:
+        List of facility dicts with distance_km, nearest first
+    """
+    index = get_facility_index()
+    if index is not None:
+        return index.query_radius(lat, lon, radius_km, top_k=top_k)
+    with borrow_hospital_locator() as locator:
+        hospitals = locator.get_hospitals_near_location(lat, lon, radius_km=radius_km)
+    return rank_facilities(hospitals or [], lat, lon, top_k=top_k)
+
+
 def display_hospital_locator():
     """Display hospital locator interface"""
     st.markdown(f"### 🏥 {get_text('find_hospitals')}")
@@ -40,35 +158,46 @@ def display_hospital_locator():
         if submitted and address:
             with st.spinner(get_text('finding_hospitals')):
                 try:
-                    locator = HospitalLocator()
-                    
                     # Get coordinates from address
-                    coords = locator.get_address_coordinates(address)
+                    coords = geocode_address(address)
                     if coords:
                         lat, lon = coords
                         
                         # Get hospitals near the location
-                        hospitals = locator.get_hospitals_near_location(lat, lon, radius_km=radius)
-                        
-                        if hospitals:
-                            st.session_state.hospitals_found = hospitals
-                            display_hospitals(hospitals)
-                            
-                            # Show map
-                            st.markdown("---")
-                            st.markdown(f"### {get_text('hospital_map')}")
-                            display_hospital_map(hospitals)
-                        else:
+                        st.session_state.hospitals_found = search_facilities(lat, lon, radius)
+                        st.session_state.hospital_page = 1
+                        if not st.session_state.hospitals_found:
                             st.warning(get_text('no_hospitals_found'))
                     else:
                         st.error(f"Could not find coordinates for address: {address}")
                         
                 except Exception as e:
                     st.error(f"Error finding hospitals: {str(e)}")
+    
+    # Results are rendered outside the form from session state, so paging
+    # through them does not repeat the search
+    hospitals = st.session_state.get("hospitals_found")
+    if hospitals:
+        display_hospitals(hospitals)
+        
+        # Show map
+        st.markdown("---")
+        st.markdown(f"### {get_text('hospital_map')}")
+        display_hospital_map(hospitals)
 
 
-def display_hospitals(hospitals: list):
-    """Display found hospitals in a formatted way"""
+def display_hospitals(hospitals: list, key_prefix: str = "hospital"):
+    """
+    Display found hospitals as paginated cards or a compact table
+    
+    Only the hospitals on the current page get widgets, so a rerun costs
+    the same whatever the number of results. The table view renders every
+    result in a single dataframe.
+    
+    Args:
+        hospitals: Facility dicts, nearest first
+        key_prefix: Prefix for widget and session state keys, unique per page
+    """
     if not hospitals:
         st.warning(get_text('no_hospitals_found'))
         return
@@ -76,84 +205,213 @@ def display_hospitals(hospitals: list):
     st.markdown(f"### 🏥 {get_text('nearby_facilities')}")
     st.markdown(f"✅ {get_text('hospitals_found')} **{len(hospitals)}** {get_text('facilities')}:")
     
-    for idx, hospital in enumerate(hospitals, 1):
-        with st.expander(
-            f"**{idx}. {hospital.get('name', get_text('unknown'))}** - {hospital.get('distance_km', 'N/A')} {get_text('km_away')}",
-            expanded=(idx == 1)
-        ):
-            col1, col2 = st.columns([2, 1])
+    col_view, col_size = st.columns([2, 1])
+    with col_view:
+        view = st.radio(
+            get_text('results_view'),
+            ["cards", "table"],
+            format_func=lambda option: get_text(f"view_{option}"),
+            horizontal=True,
+            key=f"{key_prefix}_view"
+        )
+    with col_size:
+        page_size = st.selectbox(
+            get_text('results_per_page'),
+            HOSPITAL_PAGE_SIZES,
+            key=f"{key_prefix}_page_size"
+        )
+    
+    if view == "table":
+        display_hospital_table(hospitals)
+        return
+    
+    page_count = (len(hospitals) + page_size - 1) // page_size
+    page_key = f"{key_prefix}_page"
+    page = min(max(st.session_state.get(page_key, 1), 1), page_count)
+    
+    start = (page - 1) * page_size
+    for idx, hospital in enumerate(hospitals[start:start + page_size], start + 1):
+        display_hospital_card(hospital, idx, key_prefix)
+    
+    if page_count > 1:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("◀ Previous", key=f"{key_prefix}_prev", disabled=page <= 1, use_container_width=True):
+                st.session_state[page_key] = page - 1
+                st.rerun()
+        with col_page:
+            st.caption(f"Page {page} of {page_count} · results {start + 1}-{min(start + page_size, len(hospitals))}")
+        with col_next:
+            if st.button("Next ▶", key=f"{key_prefix}_next", disabled=page >= page_count, use_container_width=True):
+                st.session_state[page_key] = page + 1
+                st.rerun()
+
+
+def display_hospital_card(hospital: dict, idx: int, key_prefix: str = "hospital"):
+    """
+    Display one hospital as an expander with details and map links
+    
+    Args:
+        hospital: Facility dict
+        idx: 1-based position in the result list
+        key_prefix: Prefix for widget keys
+    """
+    with st.expander(
+        f"**{idx}. {hospital.get('name', get_text('unknown'))}** - {hospital.get('distance_km', 'N/A')} {get_text('km_away')}",
+        expanded=(idx == 1)
+    ):
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            # Basic info
+            if hospital.get('type'):
+                st.markdown(f"**{get_text('hospital_type')}:** {hospital.get('type')}")
+            st.markdown(f"**{get_text('hospital_distance')}:** {hospital.get('distance_km', 'N/A')} km")
+            
+            # Contact info
+            if hospital.get('phone'):
+                st.markdown(f"**{get_text('hospital_phone')}** {hospital.get('phone')}")
             
-            with col1:
-                # Basic info
-                if hospital.get('type'):
-                    st.markdown(f"**{get_text('hospital_type')}:** {hospital.get('type')}")
-                st.markdown(f"**{get_text('hospital_distance')}:** {hospital.get('distance_km', 'N/A')} km")
-                
-                # Contact info
-                if hospital.get('phone'):
-                    st.markdown(f"**{get_text('hospital_phone')}** {hospital.get('phone')}")
-                
-                # Operating hours
-                if hospital.get('opening_hours'):
-                    st.markdown(f"**{get_text('hospital_hours')}** {hospital.get('opening_hours')}")
-                
-                # Operator/Organization
-                if hospital.get('operator'):
-                    st.markdown(f"**{get_text('hospital_organization')}:** {hospital.get('operator')}")
-                
-                # Website
-                if hospital.get('website'):
-                    st.markdown(f"**{get_text('hospital_website')}** [{hospital.get('website')}]({hospital.get('website')})")
+            # Operating hours
+            if hospital.get('opening_hours'):
+                st.markdown(f"**{get_text('hospital_hours')}** {hospital.get('opening_hours')}")
             
-            with col2:
-                col_map, col_nav = st.columns(2)
-                
-                with col_map:
-                    if st.button(
-                        get_text('hospital_map'),
-                        key=f"map_{idx}",
-                        use_container_width=True,
-                        help="View on Google Maps"
-                    ):
-                        st.write(f"[Open in Google Maps]({hospital.get('google_maps_url')})")
-                
-                with col_nav:
-                    if st.button(
-                        get_text('hospital_navigate'),
-                        key=f"nav_{idx}",
-                        use_container_width=True,
-                        help="Navigate to this location"
-                    ):
-                        st.write(f"[Open Navigation]({hospital.get('osm_url', hospital.get('google_maps_url'))})")
+            # Operator/Organization
+            if hospital.get('operator'):
+                st.markdown(f"**{get_text('hospital_organization')}:** {hospital.get('operator')}")
+            
+            # Website
+            if hospital.get('website'):
+                st.markdown(f"**{get_text('hospital_website')}** [{hospital.get('website')}]({hospital.get('website')})")
+        
+        with col2:
+            col_map, col_nav = st.columns(2)
             
-            # Additional info
-            st.markdown("---")
-            if hospital.get('latitude') and hospital.get('longitude'):
-                st.caption(f"{get_text('hospital_coordinates')}: {hospital.get('latitude')}, {hospital.get('longitude')}")
+            with col_map:
+                if st.button(
+                    get_text('hospital_map'),
+                    key=f"{key_prefix}_map_{idx}",
+                    use_container_width=True,
+                    help="View on Google Maps"
+                ):
+                    st.write(f"[Open in Google Maps]({hospital.get('google_maps_url')})")
+            
+            with col_nav:
+                if st.button(
+                    get_text('hospital_navigate'),
+                    key=f"{key_prefix}_nav_{idx}",
+                    use_container_width=True,
+                    help="Navigate to this location"
+                ):
+                    st.write(f"[Open Navigation]({hospital.get('osm_url', hospital.get('google_maps_url'))})")
+        
+        # Additional info
+        st.markdown("---")
+        if hospital.get('latitude') and hospital.get('longitude'):
+            st.caption(f"{get_text('hospital_coordinates')}: {hospital.get('latitude')}, {hospital.get('longitude')}")
+
 
+def display_hospital_table(hospitals: list):
+    """Display hospitals as one compact dataframe with link columns"""
+    rows = [
+        {
+            "name": hospital.get('name', get_text('unknown')),
+            "type": hospital.get('type', ""),
+            "distance_km": hospital.get('distance_km'),
+            "phone": hospital.get('phone', ""),
+            "opening_hours": hospital.get('opening_hours', ""),
+            "map": hospital.get('google_maps_url'),
+            "navigate": hospital.get('osm_url', hospital.get('google_maps_url')),
+        }
+        for hospital in hospitals
+    ]
+    st.dataframe(
+        rows,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "name": st.column_config.TextColumn(get_text('nearby_facilities')),
+            "type": st.column_config.TextColumn(get_text('hospital_type')),
+            "distance_km": st.column_config.NumberColumn(get_text('hospital_distance'), format="%.2f km"),
+            "phone": st.column_config.TextColumn(get_text('hospital_phone')),
+            "opening_hours": st.column_config.TextColumn(get_text('hospital_hours')),
+            "map": st.column_config.LinkColumn(get_text('hospital_map')),
+            "navigate": st.column_config.LinkColumn(get_text('hospital_navigate')),
+        }
+    )
 
-def display_hospital_map(hospitals: list):
-    """Display hospitals on a map using Streamlit's native map feature"""
-    if not hospitals or len(hospitals) == 0:
+
+def prepare_map_points(lats: np.ndarray, lons: np.ndarray, zoom: float) -> dict:
+    """
+    Cluster coordinates for display at a zoom level
+    
+    Args:
+        lats: Array of latitudes
+        lons: Array of longitudes
+        zoom: Map zoom level
+    
+    Returns:
+        Columnar map data with latitude, longitude, size (metres) and count
+    """
+    lats, lons, counts = cluster_points(lats, lons, zoom, cell_px=MAP_CLUSTER_CELL_PX)
+    if len(counts) == 0:
+        return {"latitude": lats, "longitude": lons, "size": np.zeros(0), "count": counts}
+    
+    marker_px = np.minimum(MAP_MARKER_PX * np.sqrt(counts), MAP_CLUSTER_CELL_PX / 2)
+    return {
+        "latitude": lats,
+        "longitude": lons,
+        "size": marker_px * pixel_metres(float(np.mean(lats)), zoom),
+        "count": counts,
+    }
+
+
+def display_hospital_map(hospitals: list, key_prefix: str = "hospital", caption: str = "🔴 Red pins show hospital locations"):
+    """
+    Display hospitals on a map using Streamlit's native map feature
+    
+    Nearby facilities are merged into one larger marker for the chosen
+    zoom level, so only one point per occupied screen cell is sent to the
+    browser. The clustered payload is cached in session state per result
+    list and zoom, so reruns reuse it.
+    
+    Args:
+        hospitals: Facility dicts
+        key_prefix: Prefix for widget and session state keys, unique per page
+        caption: Caption shown under the map
+    """
+    if not hospitals:
         return
     
-    # Prepare data for map
-    map_data = []
-    for hospital in hospitals:
-        if hospital.get("latitude") and hospital.get("longitude"):
-            map_data.append({
-                "latitude": float(hospital.get("latitude")),
-                "longitude": float(hospital.get("longitude")),
-            })
-    
-    if map_data:
-        # Create map
+    zoom = st.select_slider(
+        get_text('map_zoom'),
+        options=HOSPITAL_MAP_ZOOMS,
+        value=HOSPITAL_MAP_ZOOM,
+        key=f"{key_prefix}_map_zoom"
+    )
+    
+    cache_key = f"{key_prefix}_map_payload"
+    cached = st.session_state.get(cache_key)
+    if cached is not None and cached[0] is hospitals and cached[1] == zoom:
+        map_data = cached[2]
+    else:
+        _, lats, lons = coordinate_arrays(hospitals)
+        map_data = prepare_map_points(lats, lons, zoom)
+        st.session_state[cache_key] = (hospitals, zoom, map_data)
+    
+    if len(map_data["count"]):
         st.map(
             map_data,
-            zoom=12,
+            latitude="latitude",
+            longitude="longitude",
+            size="size",
+            zoom=zoom,
             use_container_width=True
         )
-        st.caption("🔴 Red pins show hospital locations")
+        located = int(map_data["count"].sum())
+        if len(map_data["count"]) < located:
+            st.caption(f"{caption} · {located} facilities shown as {len(map_data['count'])} markers; larger markers group nearby facilities")
+        else:
+            st.caption(caption)
     else:
         st.warning("Could not display map - no valid coordinates")
-
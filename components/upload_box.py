@@ -4,6 +4,8 @@ Upload box component for image upload
 import streamlit as st
 from typing import Optional
 import os
+import uuid
+from frontend.utils.upload_store import get_upload_store
 
 
 def render_upload_box():
@@ -29,9 +31,21 @@ def render_upload_box():
     return uploaded_file
 
 
+def get_upload_namespace() -> str:
+    """Get the current session's directory name in the upload store"""
+    if "upload_namespace" not in st.session_state:
+        st.session_state.upload_namespace = uuid.uuid4().hex
+    return st.session_state.upload_namespace
+
+
 def save_uploaded_file(uploaded_file) -> Optional[str]:
     """
-    Save uploaded file and return path
+    Save uploaded file to the managed upload store and return path
+    
+    Files are stored per session under their content digest, so an
+    identical upload is written only once and sessions never overwrite
+    each other's files. The store writes atomically and evicts old files
+    to stay within its size and age budget.
     
     Args:
         uploaded_file: Streamlit uploaded file
@@ -42,14 +56,34 @@ def save_uploaded_file(uploaded_file) -> Optional[str]:
     if uploaded_file is None:
         return None
     
-    # Create temp directory if it doesn't exist
-    os.makedirs("temp", exist_ok=True)
+    extension = os.path.splitext(uploaded_file.name)[1]
+    return get_upload_store().put(get_upload_namespace(), uploaded_file.getbuffer(), extension)
+
+
+def get_saved_upload_path(uploaded_file) -> Optional[str]:
+    """
+    Save an upload once and return its path on later reruns
+    
+    The saved path is remembered in session state per upload, keyed by
+    the uploader's file id and size, so widget interactions do not write
+    the image again. It is saved again only if the store has evicted it.
+    
+    Args:
+        uploaded_file: Streamlit uploaded file
+    
+    Returns:
+        Path to saved file or None
+    """
+    if uploaded_file is None:
+        return None
     
-    # Save file
-    file_path = os.path.join("temp", uploaded_file.name)
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+    upload_key = (getattr(uploaded_file, "file_id", uploaded_file.name), uploaded_file.size)
+    saved = st.session_state.get("saved_upload")
+    if saved is not None and saved[0] == upload_key and get_upload_store().touch(saved[1]):
+        return saved[1]
     
+    file_path = save_uploaded_file(uploaded_file)
+    st.session_state.saved_upload = (upload_key, file_path)
     return file_path
 
 
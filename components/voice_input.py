@@ -2,10 +2,47 @@
 Voice Input Component - Capture voice input for injury description
 """
 import streamlit as st
+import importlib.util
+import io
+import json
 import os
-import tempfile
-from typing import Optional, Dict, Any
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List, Union, Type, Callable
 from config.languages import get_translation
+from frontend.utils.audio_processing import (
+    VAD_MIN_SPEECH_SECONDS, audio_to_samples, detect_speech_segments, estimate_vad_threshold,
+    frame_rms, group_segments, removed_seconds
+)
+from frontend.utils.injury_analyzer import analyze_injury_text
+
+# Speech-to-text engine used unless the session picks another one
+DEFAULT_TRANSCRIPTION_ENGINE = os.getenv("TRANSCRIPTION_ENGINE", "google")
+
+# Directory of an unpacked Vosk model, e.g. vosk-model-small-en-us-0.15
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "models/vosk-model-small-en-us-0.15")
+
+# Noise probe before a clip is recorded. Engines run their own recognizers,
+# so the probe does not change recognition; silence trimming always
+# calibrates from the clip's own frame energies (see split_speech).
+#   "samples" - no probe, keep all audio (default)
+#   "ambient" - Recognizer.adjust_for_ambient_noise on the first 0.5 s,
+#               which is consumed and never transcribed
+#   "off"     - same as "samples"
+AUDIO_CALIBRATION = os.getenv("AUDIO_CALIBRATION", "samples")
+
+# Trim silence and split long clips on pauses before transcription
+VAD_ENABLED = os.getenv("VAD_ENABLED", "1") == "1"
+
+# Worker threads shared by all sessions for transcribing segments in parallel
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "4"))
+
+_transcription_pool = ThreadPoolExecutor(
+    max_workers=TRANSCRIPTION_WORKERS,
+    thread_name_prefix="transcribe"
+)
 
 
 def get_text(key: str) -> str:
@@ -55,6 +92,19 @@ def display_voice_injury_form() -> Optional[Dict[str, Any]]:
     st.markdown(f"## 🎤 {get_text('voice_input_title')}")
     st.info(get_text('record_description'))
     
+    # Speech engine selection, offering only engines that are installed
+    engine_names = available_engines()
+    if st.session_state.get("transcription_engine") not in engine_names:
+        st.session_state.transcription_engine = (
+            DEFAULT_TRANSCRIPTION_ENGINE if DEFAULT_TRANSCRIPTION_ENGINE in engine_names else engine_names[0]
+        )
+    st.selectbox(
+        "🧠 Speech engine",
+        options=engine_names,
+        format_func=lambda name: TRANSCRIPTION_ENGINES[name].label,
+        key="transcription_engine"
+    )
+    
     # Recording section
     st.markdown(f"### {get_text('record_injury')}")
     st.markdown(get_text('record_description'))
@@ -93,22 +143,14 @@ def display_voice_injury_form() -> Optional[Dict[str, Any]]:
         st.success(f"✅ {get_text('image_uploaded')}: {uploaded_file.name}")
         
         if not st.session_state.voice_processed:
-            # Save uploaded file temporarily and process
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                tmp_file.write(uploaded_file.getbuffer())
-                tmp_path = tmp_file.name
-            
-            try:
-                with st.spinner(f"🔄 {get_text('transcribing')}"):
-                    transcription = process_audio_file(tmp_path)
-                    
-                    if transcription:
-                        st.session_state.voice_transcription = transcription
-                        st.session_state.voice_processed = True
-                        st.rerun()
-            finally:
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
+            # Transcribe straight from the upload buffer
+            with st.spinner(f"🔄 {get_text('transcribing')}"):
+                transcription = process_audio_buffer(uploaded_file.getbuffer())
+                
+                if transcription:
+                    st.session_state.voice_transcription = transcription
+                    st.session_state.voice_processed = True
+                    st.rerun()
     
     # Text input fallback
     st.markdown("---")
@@ -145,10 +187,11 @@ def display_transcription_results(text: str) -> Optional[Dict[str, Any]]:
     st.markdown("---")
     st.markdown(f"### 📋 {get_text('analysis')}")
     
-    injury_type = extract_injury_type(text)
-    severity = extract_severity(text)
-    is_emergency = detect_emergency(text)
-    body_area = extract_body_area(text)
+    analysis = analyze_injury_text(text)
+    injury_type = analysis["injury_type"]
+    severity = analysis["severity"]
+    is_emergency = analysis["is_emergency"]
+    body_area = analysis["body_area"]
     
     # Display detected information
     col1, col2, col3 = st.columns(3)
@@ -206,6 +249,263 @@ def display_transcription_results(text: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+class AudioBuffer(io.RawIOBase):
+    """Read-only, seekable file object over an in-memory buffer, without copying it"""
+    
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def readinto(self, b) -> int:
+        size = min(len(b), len(self._view) - self._pos)
+        b[:size] = self._view[self._pos:self._pos + size]
+        self._pos += size
+        return size
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+    
+    def tell(self) -> int:
+        return self._pos
+
+
+def sniff_audio_format(buffer: Union[bytes, bytearray, memoryview]) -> Optional[str]:
+    """
+    Detect the container format from the leading magic bytes
+    
+    Args:
+        buffer: Raw audio file contents
+    
+    Returns:
+        "wav", "aiff", "flac" or None if unrecognized
+    """
+    header = bytes(memoryview(buffer)[:12])
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav"
+    if header[:4] == b"FORM" and header[8:12] in (b"AIFF", b"AIFC"):
+        return "aiff"
+    if header[:4] == b"fLaC":
+        return "flac"
+    return None
+
+
+def aiff_to_wav(buffer: Union[bytes, bytearray, memoryview]) -> bytes:
+    """
+    Convert AIFF/AIFF-C audio to WAV in memory
+    
+    ``sr.AudioFile`` tries WAV first and does not rewind a file object when
+    that fails, so AIFF cannot be handed to it as a stream.
+    
+    Args:
+        buffer: Raw AIFF file contents
+    
+    Returns:
+        WAV file contents with the same samples
+    """
+    import aifc
+    import audioop
+    import wave
+    
+    with aifc.open(AudioBuffer(buffer), "rb") as reader:
+        params = reader.getparams()
+        frames = reader.readframes(params.nframes)
+    
+    output = io.BytesIO()
+    with wave.open(output, "wb") as writer:
+        writer.setnchannels(params.nchannels)
+        writer.setsampwidth(params.sampwidth)
+        writer.setframerate(params.framerate)
+        # AIFF samples are big-endian, WAV samples little-endian
+        writer.writeframes(audioop.byteswap(frames, params.sampwidth))
+    return output.getvalue()
+
+
+def open_audio_buffer(buffer: Union[bytes, bytearray, memoryview]):
+    """
+    Wrap in-memory audio as a SpeechRecognition source, without writing to disk
+    
+    WAV is read in place. AIFF is converted to WAV in memory, and FLAC is
+    decoded to WAV (the converter's default output) in memory through the
+    FLAC converter bundled with SpeechRecognition.
+    
+    Args:
+        buffer: Raw audio file contents, e.g. ``UploadedFile.getbuffer()``
+    
+    Returns:
+        ``sr.AudioFile`` ready to be used as a context manager
+    """
+    import speech_recognition as sr
+    
+    audio_format = sniff_audio_format(buffer)
+    if audio_format == "wav":
+        return sr.AudioFile(AudioBuffer(buffer))
+    
+    if audio_format == "aiff":
+        return sr.AudioFile(io.BytesIO(aiff_to_wav(buffer)))
+    
+    if audio_format == "flac":
+        process = subprocess.Popen(
+            [sr.get_flac_converter(), "--stdout", "--totally-silent", "--decode", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+        wav_data, _ = process.communicate(memoryview(buffer))
+        return sr.AudioFile(io.BytesIO(wav_data))
+    
+    raise ValueError("Unsupported audio format. Please upload a WAV or FLAC file.")
+
+
+class TranscriptionEngine(ABC):
+    """
+    Base class for speech-to-text engines
+    
+    Subclasses are registered with ``register_engine`` and instantiated once
+    per process by ``get_transcription_engine``, so expensive state such as
+    a loaded model is shared by every session. ``transcribe`` must raise
+    ``sr.UnknownValueError`` when nothing was recognized and
+    ``sr.RequestError`` when a remote service fails.
+    """
+    
+    name = ""
+    label = ""
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the engine's optional packages and models are installed, checked without loading them"""
+        return True
+    
+    @abstractmethod
+    def transcribe(self, audio_data) -> str:
+        """
+        Transcribe audio
+        
+        Args:
+            audio_data: ``sr.AudioData`` to transcribe
+        
+        Returns:
+            Transcribed text
+        """
+
+
+TRANSCRIPTION_ENGINES: Dict[str, Type[TranscriptionEngine]] = {}
+
+_engine_instances: Dict[str, TranscriptionEngine] = {}
+_engine_lock = threading.Lock()
+
+
+def register_engine(engine_class: Type[TranscriptionEngine]) -> Type[TranscriptionEngine]:
+    """Register a transcription engine class under its name"""
+    TRANSCRIPTION_ENGINES[engine_class.name] = engine_class
+    return engine_class
+
+
+def available_engines() -> List[str]:
+    """
+    Get the names of registered engines that can be loaded here
+    
+    Returns:
+        Engine names in registration order
+    """
+    return [name for name, engine_class in TRANSCRIPTION_ENGINES.items() if engine_class.is_available()]
+
+
+def get_transcription_engine(name: str = None) -> TranscriptionEngine:
+    """
+    Get the shared instance of a transcription engine, loading it on first use
+    
+    Args:
+        name: Registered engine name; defaults to DEFAULT_TRANSCRIPTION_ENGINE
+    
+    Returns:
+        Engine instance shared across sessions
+    """
+    name = name or DEFAULT_TRANSCRIPTION_ENGINE
+    if name not in TRANSCRIPTION_ENGINES:
+        raise ValueError(f"Unknown transcription engine: {name}")
+    
+    with _engine_lock:
+        engine = _engine_instances.get(name)
+        if engine is None:
+            try:
+                engine = TRANSCRIPTION_ENGINES[name]()
+            except Exception as e:
+                raise RuntimeError(f"Could not load {TRANSCRIPTION_ENGINES[name].label}: {str(e)}") from e
+            _engine_instances[name] = engine
+    return engine
+
+
+@register_engine
+class GoogleSpeechEngine(TranscriptionEngine):
+    """Google Web Speech API (requires internet)"""
+    
+    name = "google"
+    label = "Google Web Speech (online)"
+    
+    def transcribe(self, audio_data) -> str:
+        import speech_recognition as sr
+        return sr.Recognizer().recognize_google(audio_data, language='en-US')
+
+
+@register_engine
+class VoskEngine(TranscriptionEngine):
+    """Vosk / Kaldi offline recognizer running on the local CPU"""
+    
+    name = "vosk"
+    label = "Vosk (offline)"
+    sample_rate = 16000
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        return importlib.util.find_spec("vosk") is not None and os.path.isdir(VOSK_MODEL_PATH)
+    
+    def __init__(self, model_path: str = VOSK_MODEL_PATH):
+        from vosk import Model, SetLogLevel
+        SetLogLevel(-1)
+        self.model = Model(model_path)
+    
+    def transcribe(self, audio_data) -> str:
+        import speech_recognition as sr
+        from vosk import KaldiRecognizer
+        
+        # The model is shared; recognizers are cheap and per call
+        recognizer = KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.AcceptWaveform(audio_data.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "")
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+@register_engine
+class SphinxEngine(TranscriptionEngine):
+    """CMU PocketSphinx offline recognizer running on the local CPU"""
+    
+    name = "sphinx"
+    label = "PocketSphinx (offline)"
+    
+    @classmethod
+    def is_available(cls) -> bool:
+        return importlib.util.find_spec("pocketsphinx") is not None
+    
+    def __init__(self):
+        import pocketsphinx  # noqa: F401 - fail at load time rather than per request
+    
+    def transcribe(self, audio_data) -> str:
+        import speech_recognition as sr
+        return sr.Recognizer().recognize_sphinx(audio_data, language='en-US')
+
+
 def process_audio(audio_data) -> Optional[str]:
     """
     Process recorded audio and transcribe
@@ -216,22 +516,20 @@ def process_audio(audio_data) -> Optional[str]:
     Returns:
         Transcribed text or None
     """
-    try:
-        # Save audio data to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-            tmp_file.write(audio_data.getbuffer())
-            tmp_path = tmp_file.name
-        
-        try:
-            transcription = process_audio_file(tmp_path)
-            return transcription
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+    return process_audio_buffer(audio_data.getbuffer())
+
+
+def process_audio_buffer(buffer: Union[bytes, bytearray, memoryview]) -> Optional[str]:
+    """
+    Transcribe in-memory WAV or FLAC audio
     
-    except Exception as e:
-        st.error(f"❌ Error processing audio: {str(e)}")
-        return None
+    Args:
+        buffer: Raw audio file contents
+    
+    Returns:
+        Transcribed text or None
+    """
+    return transcribe_audio(buffer)
 
 
 def process_audio_file(file_path: str) -> Optional[str]:
@@ -241,31 +539,165 @@ def process_audio_file(file_path: str) -> Optional[str]:
     Args:
         file_path: Path to audio file
     
+    Returns:
+        Transcribed text or None
+    """
+    return transcribe_audio(file_path)
+
+
+def split_speech(audio_data):
+    """
+    Trim silence from a clip and split it into chunks at pauses
+    
+    The speech/silence threshold is estimated from the clip's frame
+    energies (see ``estimate_vad_threshold``), which are computed once and
+    reused for segment detection. Speech segments are packed into chunks of at most
+    VAD_MAX_SEGMENT_SECONDS, so long recordings can be transcribed in
+    parallel without one engine call per pause. When the clip has no
+    distinguishable silence, or almost no speech is detected, the whole
+    clip is returned untrimmed so the engine still gets to hear it.
+    
+    Args:
+        audio_data: ``sr.AudioData`` to split
+    
+    Returns:
+        Tuple of (list of ``sr.AudioData`` chunks, seconds of silence removed)
+    """
+    import numpy as np
+    import speech_recognition as sr
+    
+    samples, sample_rate = audio_to_samples(audio_data)
+    energies = frame_rms(samples, sample_rate)
+    threshold = estimate_vad_threshold(energies)
+    if threshold is None:
+        return [audio_data], 0.0
+    
+    segments = detect_speech_segments(samples, sample_rate, threshold, energies=energies)
+    kept = sum(end - start for start, end in segments)
+    if kept < VAD_MIN_SPEECH_SECONDS * sample_rate:
+        return [audio_data], 0.0
+    
+    clips = [
+        sr.AudioData(
+            np.concatenate([samples[start:end] for start, end in chunk]).tobytes(),
+            sample_rate,
+            2
+        )
+        for chunk in group_segments(segments, sample_rate)
+    ]
+    return clips, removed_seconds(segments, len(samples), sample_rate)
+
+
+def transcribe_clips(
+    engine: TranscriptionEngine,
+    clips,
+    on_progress: Callable[[str, int, int], None] = None
+) -> str:
+    """
+    Transcribe speech segments concurrently and stitch the text back in order
+    
+    Segments run on the shared transcription pool. Segments the engine
+    cannot understand are skipped; if none are understood,
+    ``sr.UnknownValueError`` is raised. Any other engine error cancels the
+    remaining segments and is re-raised.
+    
+    Args:
+        engine: Transcription engine
+        clips: ``sr.AudioData`` segments
+        on_progress: Called from the calling thread as segments finish, with
+            the partial transcript (pending segments shown as "…"), the
+            number of finished segments and the total
+    
+    Returns:
+        Transcribed text
+    """
+    import speech_recognition as sr
+    
+    texts = [None] * len(clips)
+    futures = {
+        _transcription_pool.submit(engine.transcribe, clip): index
+        for index, clip in enumerate(clips)
+    }
+    
+    try:
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                texts[futures[future]] = future.result()
+            except sr.UnknownValueError:
+                texts[futures[future]] = ""
+            
+            if on_progress:
+                partial = " ".join("…" if text is None else text for text in texts if text != "")
+                on_progress(partial, done, len(clips))
+    except Exception:
+        for future in futures:
+            future.cancel()
+        raise
+    
+    texts = [text for text in texts if text]
+    if not texts:
+        raise sr.UnknownValueError()
+    return " ".join(texts)
+
+
+def transcribe_audio(
+    file_or_buffer: Union[str, bytes, bytearray, memoryview],
+    engine_name: str = None
+) -> Optional[str]:
+    """
+    Transcribe audio using SpeechRecognition
+    
+    Args:
+        file_or_buffer: Path to an audio file, or the raw file contents in memory
+        engine_name: Transcription engine; defaults to the session's selection
+    
     Returns:
         Transcribed text or None
     """
     try:
         import speech_recognition as sr
         
+        engine = get_transcription_engine(
+            engine_name or st.session_state.get("transcription_engine", DEFAULT_TRANSCRIPTION_ENGINE)
+        )
+        
         recognizer = sr.Recognizer()
         recognizer.energy_threshold = 3000
         recognizer.dynamic_energy_threshold = True
         
         try:
-            # Load audio file
-            audio = sr.AudioFile(file_path)
+            # Load audio
+            if isinstance(file_or_buffer, str):
+                audio = sr.AudioFile(file_or_buffer)
+            else:
+                audio = open_audio_buffer(file_or_buffer)
             
             with audio as source:
                 st.info("🔄 Transcribing audio...")
                 
                 # Adjust for ambient noise
-                recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                if AUDIO_CALIBRATION == "ambient":
+                    recognizer.adjust_for_ambient_noise(source, duration=0.5)
                 
                 # Record audio from file
                 audio_data = recognizer.record(source)
             
-            # Recognize using Google Speech Recognition
-            text = recognizer.recognize_google(audio_data, language='en-US')
+            # Cut silence so the engine only processes speech
+            if VAD_ENABLED:
+                clips, trimmed = split_speech(audio_data)
+                if trimmed > 0:
+                    st.caption(f"✂️ Removed {trimmed:.1f}s of silence")
+            else:
+                clips = [audio_data]
+            
+            # Recognize using the selected engine, streaming partial text
+            progress = st.empty()
+            
+            def show_progress(partial_text: str, done: int, total: int):
+                progress.info(f"📝 {done}/{total} segments: {partial_text}")
+            
+            text = transcribe_clips(engine, clips, on_progress=show_progress if len(clips) > 1 else None)
+            progress.empty()
             st.success("✅ Transcription complete!")
             return text
         
@@ -302,10 +734,11 @@ def process_transcription(text: str) -> Dict[str, Any]:
     st.markdown("---")
     st.markdown("### 📋 Detected Information")
     
-    injury_type = extract_injury_type(text)
-    severity = extract_severity(text)
-    is_emergency = detect_emergency(text)
-    body_area = extract_body_area(text)
+    analysis = analyze_injury_text(text)
+    injury_type = analysis["injury_type"]
+    severity = analysis["severity"]
+    is_emergency = analysis["is_emergency"]
+    body_area = analysis["body_area"]
     
     # Display detected information
     col1, col2, col3 = st.columns(3)
@@ -358,85 +791,22 @@ def process_transcription(text: str) -> Dict[str, Any]:
 
 def extract_injury_type(text: str) -> Optional[str]:
     """Extract injury type from text"""
-    if not text:
-        return "General Injury"  # Default value
-    
-    text_lower = text.lower()
-    
-    injury_keywords = {
-        "Cuts and Wounds": ["cut", "wound", "bleeding", "laceration", "slice", "gash", "slash"],
-        "Burns": ["burn", "burnt", "scorched", "heat", "fire", "hot", "scalded"],
-        "Fractures": ["fracture", "broken", "break", "crack", "snapped", "fractured"],
-        "Head Injury": ["head", "concussion", "impact", "knocked", "hit head", "brain"],
-        "Shock": ["shock", "shocked", "pale", "weak", "faint"],
-        "Allergic Reaction": ["allergy", "allergic", "reaction", "rash", "swelling", "itching"],
-        "Severe Bleeding": ["severe bleed", "heavy bleed", "gushing", "hemorrhage", "arterial"],
-        "Choking": ["choking", "choke", "can't breath", "stuck", "blocking", "lodged"],
-        "Poisoning": ["poison", "toxic", "ingested", "swallowed", "overdose"],
-    }
-    
-    for injury, keywords in injury_keywords.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                return injury
-    
-    return "General Injury"  # Default if no keywords match
+    return analyze_injury_text(text)["injury_type"]
 
 
 def extract_severity(text: str) -> Optional[str]:
     """Extract severity level from text"""
-    if not text:
-        return "Moderate"  # Default to moderate if cannot determine
-    
-    text_lower = text.lower()
-    
-    if any(word in text_lower for word in ["severe", "very bad", "critical", "emergency", "urgent", "extremely", "seriously", "terrible"]):
-        return "Severe"
-    elif any(word in text_lower for word in ["moderate", "bad", "significant", "serious", "quite bad", "fairly bad"]):
-        return "Moderate"
-    elif any(word in text_lower for word in ["mild", "minor", "small", "light", "little", "slight", "barely"]):
-        return "Mild"
-    
-    return "Moderate"  # Default to moderate if cannot determine
+    return analyze_injury_text(text)["severity"]
 
 
 def extract_body_area(text: str) -> Optional[str]:
     """Extract body area from text"""
-    if not text:
-        return None
-    
-    text_lower = text.lower()
-    
-    body_areas = [
-        "head", "face", "eye", "eyes", "nose", "mouth", "ear", "ears",
-        "neck", "shoulder", "shoulders", "arm", "arms", "elbow", "elbows",
-        "hand", "hands", "finger", "fingers", "chest", "back", "torso",
-        "abdomen", "belly", "stomach", "leg", "legs", "knee", "knees",
-        "ankle", "ankles", "foot", "feet", "toe", "toes", "skin", "wrist", "wrists"
-    ]
-    
-    for area in body_areas:
-        if area in text_lower:
-            return area.capitalize()
-    
-    return None
+    return analyze_injury_text(text)["body_area"]
 
 
 def detect_emergency(text: str) -> bool:
     """Detect if text indicates emergency"""
-    if not text:
-        return False
-    
-    emergency_keywords = [
-        "emergency", "urgent", "critical", "severe", "call 911",
-        "unconscious", "not breathing", "no pulse", "bleeding heavily",
-        "choking", "poisoned", "overdose", "heart attack", "stroke",
-        "unresponsive", "can't breathe", "difficulty breathing", "severe pain",
-        "loss of consciousness", "suicidal", "bleeding won't stop"
-    ]
-    
-    text_lower = text.lower()
-    return any(keyword in text_lower for keyword in emergency_keywords)
+    return analyze_injury_text(text)["is_emergency"]
 
 
 def display_voice_input_button() -> Optional[str]:
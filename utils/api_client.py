@@ -1,10 +1,114 @@
 """
 API client for frontend communication with backend
 """
+import asyncio
+import gzip
+import json
+import threading
+import time
 import requests
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from typing import Dict, Any, Optional, List, Awaitable, Callable, NamedTuple
 import os
 from config.settings import BACKEND_URL
+from frontend.utils.cache import SingleFlight, TTLCache, file_digest, normalize_key
+from frontend.utils.health_monitor import get_health_monitor
+from frontend.utils.image_processing import prepare_image
+from frontend.utils.multipart import ProgressCallback, multipart_body
+from frontend.utils.resilience import FAILURE_STATUS_CODES, RETRY_STATUS_CODES, get_resilience_policy
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; only gzip request compression is available
+    zstandard = None
+
+# Maximum number of keep-alive connections the shared AsyncAPIClient holds open
+ASYNC_POOL_SIZE = int(os.getenv("API_ASYNC_POOL_SIZE", "8"))
+
+# Guidance responses depend only on their arguments, so they are cached
+# process-wide and shared by every session
+GUIDANCE_CACHE_SIZE = int(os.getenv("GUIDANCE_CACHE_SIZE", "512"))
+GUIDANCE_CACHE_TTL = float(os.getenv("GUIDANCE_CACHE_TTL", "3600"))
+
+_guidance_cache = TTLCache(max_entries=GUIDANCE_CACHE_SIZE, ttl=GUIDANCE_CACHE_TTL)
+
+# Image analyses are cached by image content and age group, so re-uploads
+# of the same photo are answered without a backend round trip
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "256"))
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", "3600"))
+
+_analysis_cache = TTLCache(max_entries=ANALYSIS_CACHE_SIZE, ttl=ANALYSIS_CACHE_TTL)
+
+
+# Identical guidance, analysis and upload calls made concurrently by
+# different sessions share one backend request
+_in_flight = SingleFlight()
+
+# Request body compression: "gzip", "zstd" or "" (off). The backend must
+# accept Content-Encoding on requests; backends that reject a compressed
+# body are remembered and sent plain bodies from then on
+REQUEST_COMPRESSION = os.getenv("API_REQUEST_COMPRESSION", "").lower()
+
+# JSON bodies smaller than this are sent uncompressed
+REQUEST_COMPRESSION_THRESHOLD = int(os.getenv("API_REQUEST_COMPRESSION_THRESHOLD", "1024"))
+
+_compression_unsupported = set()
+
+# (base URL, path) of routes that only accept their fields as query parameters
+_json_unsupported = set()
+
+# Voice text analyses are memoized per transcript, so the per-field
+# detection methods share one backend call
+VOICE_ANALYSIS_CACHE_SIZE = int(os.getenv("VOICE_ANALYSIS_CACHE_SIZE", "256"))
+VOICE_ANALYSIS_CACHE_TTL = float(os.getenv("VOICE_ANALYSIS_CACHE_TTL", "3600"))
+
+_voice_analysis_cache = TTLCache(max_entries=VOICE_ANALYSIS_CACHE_SIZE, ttl=VOICE_ANALYSIS_CACHE_TTL)
+
+# Backends that answered the combined voice analysis route with 404/405
+_voice_analyze_unsupported = set()
+
+# Backends that answered the batch guidance route with 404/405 or a
+# malformed body; guidance for them is fetched with concurrent single
+# requests instead
+_batch_unsupported = set()
+
+# Worker threads shared by all sessions for the single guidance requests
+# of the batch fallback; each caller also runs one request itself
+GUIDANCE_FALLBACK_WORKERS = int(os.getenv("GUIDANCE_FALLBACK_WORKERS", "8"))
+
+_guidance_fallback_executor = ThreadPoolExecutor(
+    max_workers=GUIDANCE_FALLBACK_WORKERS,
+    thread_name_prefix="guidance-fallback"
+)
+
+
+
+class GuidanceBundle(NamedTuple):
+    """Guidance responses for one injury; None for parts not requested"""
+    first_aid: Optional[Dict[str, Any]] = None
+    emergency: Optional[Dict[str, Any]] = None
+    prevention: Optional[Dict[str, Any]] = None
+
+
+def _is_error_result(result: Any) -> bool:
+    """Check whether a response payload reports an error"""
+    return not isinstance(result, dict) or "error" in result or result.get("status") == "error"
+
+
+def _call_concurrently(calls: List[Callable[[], Any]]) -> List[Any]:
+    """
+    Run calls concurrently and return their results in order
+    
+    The first call runs in the caller's thread and the rest on the shared
+    guidance fallback pool, so every caller makes progress even while the
+    pool is busy with other sessions' requests.
+    """
+    futures = [_guidance_fallback_executor.submit(call) for call in calls[1:]]
+    first = calls[0]()
+    return [first] + [future.result() for future in futures]
 
 
 class APIClient:
@@ -19,34 +123,279 @@ class APIClient:
         """
         self.base_url = base_url
         self.session = requests.Session()
+        # Advertise every response encoding urllib3 can decode here
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self.health_monitor = get_health_monitor(base_url)
+        self.policy = get_resilience_policy(base_url)
     
-    def upload_image(self, image_path: str, age_group: str = None) -> Dict[str, Any]:
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Send a request under the shared resilience policy
+        
+        A scalar ``timeout`` is the read timeout; the connect timeout comes
+        from the policy. Idempotent requests are retried with jittered
+        exponential backoff after connection errors (including connect
+        timeouts) and 502/503/504; a read timeout is not retried, so one
+        hung request costs at most one read timeout. Every outcome is
+        reported to the circuit breaker and the health monitor; client-side
+        errors are not counted as backend failures.
+        
+        Args:
+            method: HTTP method
+            path: Path relative to the base URL
+            **kwargs: Passed through to requests
+        
+        Returns:
+            Response object (the last one if all retries answered 502/503/504)
+        
+        Raises:
+            CircuitOpenError: If the circuit is open (a ConnectionError)
+            requests.exceptions.ReadTimeout: If the backend did not answer in time
+        """
+        kwargs["timeout"] = self.policy.timeouts(kwargs.get("timeout"))
+        attempts = self.policy.attempts(method)
+        
+        for attempt in range(attempts):
+            if attempt:
+                self.policy.record_retry()
+                time.sleep(self.policy.backoff(attempt - 1))
+            
+            self.policy.before_request()
+            try:
+                response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.health_monitor.mark_unhealthy(str(e))
+                self.policy.record_failure()
+                # ConnectTimeout is also a ConnectionError and is retried
+                if attempt + 1 < attempts and isinstance(e, requests.exceptions.ConnectionError):
+                    continue
+                raise
+            except Exception:
+                # Not a backend fault, but the attempt must still be settled
+                # so a half-open circuit does not wait on it forever
+                self.policy.record_abandoned()
+                raise
+            
+            if response.status_code in FAILURE_STATUS_CODES:
+                self.health_monitor.mark_unhealthy(f"HTTP {response.status_code}")
+                self.policy.record_failure()
+                if attempt + 1 < attempts and response.status_code in RETRY_STATUS_CODES:
+                    response.close()
+                    continue
+            else:
+                self.health_monitor.mark_healthy()
+                self.policy.record_success()
+            return response
+    
+    def resilience_stats(self) -> Dict[str, Any]:
+        """
+        Get circuit breaker state and retry counters for this backend
+        
+        Returns:
+            Dictionary with state, retry_in and request/retry/failure counters
+        """
+        return self.policy.snapshot()
+    
+    def _encode_json(self, payload: Dict[str, Any]) -> tuple:
+        """
+        Serialize a JSON body, compressing it above the size threshold
+        
+        Args:
+            payload: JSON-serializable body
+        
+        Returns:
+            Tuple of (body bytes, headers)
+        """
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if (
+            len(body) < REQUEST_COMPRESSION_THRESHOLD
+            or self.base_url in _compression_unsupported
+        ):
+            return body, headers
+        
+        if REQUEST_COMPRESSION == "gzip":
+            headers["Content-Encoding"] = "gzip"
+            return gzip.compress(body, compresslevel=6), headers
+        if REQUEST_COMPRESSION == "zstd" and zstandard is not None:
+            headers["Content-Encoding"] = "zstd"
+            return zstandard.ZstdCompressor().compress(body), headers
+        return body, headers
+    
+    def _post_json(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        timeout: float,
+        query_fallback: bool = False
+    ) -> requests.Response:
+        """
+        POST a JSON body, falling back for backends that cannot take it
+        
+        A compressed body rejected with 400/415/422 is resent plain and the
+        backend is remembered as not accepting compression. With
+        ``query_fallback``, a 422 for the JSON body is retried with the
+        fields as query parameters, as the legacy routes expect, and the
+        route is remembered if that works.
+        
+        Args:
+            path: Path relative to the base URL
+            payload: JSON body
+            timeout: Request timeout in seconds
+            query_fallback: Retry as query parameters on 422
+        
+        Returns:
+            Response object
+        """
+        params = {key: value for key, value in payload.items() if value is not None}
+        if query_fallback and (self.base_url, path) in _json_unsupported:
+            return self._request("POST", path, params=params, timeout=timeout)
+        
+        body, headers = self._encode_json(payload)
+        response = self._request("POST", path, data=body, headers=headers, timeout=timeout)
+        
+        if "Content-Encoding" in headers and response.status_code in (400, 415, 422):
+            plain = self._request("POST", path, json=payload, timeout=timeout)
+            if plain.status_code < 400:
+                _compression_unsupported.add(self.base_url)
+            response = plain
+        
+        if query_fallback and response.status_code == 422:
+            legacy = self._request("POST", path, params=params, timeout=timeout)
+            if legacy.status_code < 400:
+                _json_unsupported.add((self.base_url, path))
+                response = legacy
+        
+        return response
+    
+    @staticmethod
+    def _store_guidance(cache_key: tuple, result: Dict[str, Any], use_cache: bool) -> Dict[str, Any]:
+        """Put a successful guidance response in the shared cache and return it"""
+        if use_cache and not _is_error_result(result):
+            _guidance_cache.set(cache_key, result)
+        return result
+    
+    @staticmethod
+    def guidance_cache_stats() -> Dict[str, int]:
+        """
+        Get shared guidance cache counters
+        
+        Returns:
+            Dictionary with size, hits, misses and evictions
+        """
+        return _guidance_cache.stats()
+    
+    @staticmethod
+    def analysis_cache_stats() -> Dict[str, int]:
+        """
+        Get shared image analysis cache counters
+        
+        Returns:
+            Dictionary with size, hits, misses and evictions
+        """
+        return _analysis_cache.stats()
+    
+    @staticmethod
+    def in_flight_stats() -> Dict[str, int]:
+        """
+        Get request coalescing counters
+        
+        Returns:
+            Dictionary with in-flight keys, backend calls made and calls shared
+        """
+        return _in_flight.stats()
+    
+    def upload_image(
+        self,
+        image_path: str,
+        age_group: str = None,
+        preprocess: bool = True,
+        use_cache: bool = True,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
         """
         Upload and analyze an image
         
+        The image is downscaled and re-encoded without metadata before
+        upload (see ``prepare_image``); images Pillow cannot decode are
+        streamed from disk unchanged. The result carries an ``upload``
+        entry with the original and sent sizes. Results are cached by the
+        BLAKE2b digest of the original file and the age group.
+        
         Args:
             image_path: Path to image file
             age_group: Optional age group
+            preprocess: Downscale and re-encode before upload
+            use_cache: Serve and store the result in the shared analysis cache
+            on_progress: Called with (bytes sent, total bytes) during upload
         
         Returns:
             Analysis result
         """
         try:
+            cache_key = normalize_key(file_digest(image_path), age_group, preprocess)
+            if use_cache:
+                cached = _analysis_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
+            return _in_flight.do(
+                (self.base_url, "image", use_cache) + cache_key,
+                partial(self._send_image, image_path, age_group, preprocess, cache_key, use_cache, on_progress)
+            )
+        
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def _send_image(
+        self,
+        image_path: str,
+        age_group: Optional[str],
+        preprocess: bool,
+        cache_key: tuple,
+        use_cache: bool,
+        on_progress: Optional[ProgressCallback]
+    ) -> Dict[str, Any]:
+        """Prepare and upload an image for analysis and cache the result"""
+        try:
+            encoded = None
+            if preprocess:
+                try:
+                    encoded, upload = prepare_image(image_path)
+                except (OSError, ValueError):
+                    encoded = None
+            
+            params = {}
+            if age_group:
+                params['age_group'] = age_group
+            
+            filename = os.path.basename(image_path)
             with open(image_path, 'rb') as f:
-                files = {'file': f}
-                params = {}
-                if age_group:
-                    params['age_group'] = age_group
+                if encoded is None:
+                    size = os.fstat(f.fileno()).st_size
+                    upload = {"original_bytes": size, "sent_bytes": size}
+                    file_field = (filename, f)
+                else:
+                    stem = os.path.splitext(filename)[0]
+                    file_field = (stem + upload["extension"], encoded, upload["content_type"])
                 
-                response = self.session.post(
-                    f"{self.base_url}/analyze/image",
-                    files=files,
+                body, headers = multipart_body({'file': file_field}, on_progress=on_progress)
+                response = self._request(
+                    "POST",
+                    "/analyze/image",
+                    data=body,
+                    headers=headers,
                     params=params,
                     timeout=30
                 )
             
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+            if isinstance(result, dict):
+                result["upload"] = upload
+            if use_cache and not _is_error_result(result):
+                _analysis_cache.set(cache_key, result)
+            return result
         
         except requests.exceptions.ConnectionError:
             return {"error": "Could not connect to backend. Is it running?"}
@@ -58,7 +407,8 @@ class APIClient:
         injury_type: str,
         severity: str,
         affected_area: str = None,
-        age_group: str = "adult"
+        age_group: str = "adult",
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Get first aid guidance for an injury
@@ -68,27 +418,37 @@ class APIClient:
             severity: Severity level
             affected_area: Affected area
             age_group: Patient age group
+            use_cache: Serve and store the response in the shared guidance cache
         
         Returns:
             First aid guidance
         """
+        cache_key = normalize_key("first-aid", injury_type, severity, affected_area, age_group)
+        if use_cache:
+            cached = _guidance_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        payload = {
+            "injury_type": injury_type,
+            "severity": severity,
+            "age_group": age_group
+        }
+        if affected_area:
+            payload["affected_area"] = affected_area
+        
+        return _in_flight.do(
+            (self.base_url, use_cache) + cache_key,
+            partial(self._fetch_first_aid_guidance, cache_key, payload, use_cache)
+        )
+    
+    def _fetch_first_aid_guidance(self, cache_key: tuple, payload: Dict[str, Any], use_cache: bool) -> Dict[str, Any]:
+        """Request first aid guidance from the backend and cache it"""
         try:
-            params = {
-                "injury_type": injury_type,
-                "severity": severity,
-                "age_group": age_group
-            }
-            if affected_area:
-                params["affected_area"] = affected_area
-            
-            response = self.session.post(
-                f"{self.base_url}/first-aid/generate",
-                params=params,
-                timeout=30
-            )
+            response = self._post_json("/first-aid/generate", payload, timeout=30, query_fallback=True)
             
             response.raise_for_status()
-            return response.json()
+            return self._store_guidance(cache_key, response.json(), use_cache)
         
         except requests.exceptions.Timeout:
             return {"status": "error", "error": {"message": "Request timeout - backend is slow to respond"}}
@@ -100,67 +460,214 @@ class APIClient:
             print(f"[DEBUG] First aid guidance error: {type(e).__name__}: {str(e)}")
             return {"status": "error", "error": {"message": str(e)}}
     
-    def get_emergency_guidance(self, injury_type: str) -> Dict[str, Any]:
+    def get_emergency_guidance(self, injury_type: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Get emergency guidance
         
         Args:
             injury_type: Type of injury
+            use_cache: Serve and store the response in the shared guidance cache
         
         Returns:
             Emergency guidance
         """
+        cache_key = normalize_key("emergency", injury_type)
+        if use_cache:
+            cached = _guidance_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        return _in_flight.do(
+            (self.base_url, use_cache) + cache_key,
+            partial(self._fetch_guidance, f"/first-aid/emergency/{injury_type}", cache_key, use_cache)
+        )
+    
+    def get_prevention_tips(self, injury_type: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Get prevention tips
+        
+        Args:
+            injury_type: Type of injury
+            use_cache: Serve and store the response in the shared guidance cache
+        
+        Returns:
+            Prevention tips
+        """
+        cache_key = normalize_key("prevention", injury_type)
+        if use_cache:
+            cached = _guidance_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        return _in_flight.do(
+            (self.base_url, use_cache) + cache_key,
+            partial(self._fetch_guidance, f"/first-aid/prevention/{injury_type}", cache_key, use_cache)
+        )
+    
+    def _fetch_guidance(self, path: str, cache_key: tuple, use_cache: bool) -> Dict[str, Any]:
+        """GET a guidance route from the backend and cache the response"""
         try:
-            response = self.session.get(
-                f"{self.base_url}/first-aid/emergency/{injury_type}",
-                timeout=10
-            )
+            response = self._request("GET", path, timeout=10)
             
             response.raise_for_status()
-            return response.json()
+            return self._store_guidance(cache_key, response.json(), use_cache)
         
         except Exception as e:
             return {"error": str(e)}
     
-    def get_prevention_tips(self, injury_type: str) -> Dict[str, Any]:
+    def get_guidance_batch(
+        self,
+        injury_type: str,
+        severity: str,
+        affected_area: str = None,
+        age_group: str = "adult",
+        include_emergency: bool = False,
+        include_prevention: bool = False,
+        use_cache: bool = True
+    ) -> GuidanceBundle:
         """
-        Get prevention tips
+        Get first aid guidance and optionally emergency guidance and
+        prevention tips for an injury in one round trip
+        
+        Parts found in the shared guidance cache are not requested. The
+        rest go to ``POST /first-aid/batch`` together, coalesced with
+        identical batches already in flight; backends without that route
+        are remembered and served by concurrent single requests instead.
         
         Args:
             injury_type: Type of injury
+            severity: Severity level
+            affected_area: Affected area
+            age_group: Patient age group
+            include_emergency: Also get emergency guidance
+            include_prevention: Also get prevention tips
+            use_cache: Serve and store the responses in the shared guidance cache
         
         Returns:
-            Prevention tips
+            GuidanceBundle with the response of each requested part
         """
-        try:
-            response = self.session.get(
-                f"{self.base_url}/first-aid/prevention/{injury_type}",
-                timeout=10
+        parts = {
+            "first_aid": (
+                normalize_key("first-aid", injury_type, severity, affected_area, age_group),
+                {
+                    "kind": "first_aid",
+                    "injury_type": injury_type,
+                    "severity": severity,
+                    "affected_area": affected_area,
+                    "age_group": age_group,
+                },
+                partial(self.get_first_aid_guidance, injury_type, severity, affected_area, age_group, use_cache),
+            ),
+        }
+        if include_emergency:
+            parts["emergency"] = (
+                normalize_key("emergency", injury_type),
+                {"kind": "emergency", "injury_type": injury_type},
+                partial(self.get_emergency_guidance, injury_type, use_cache),
             )
+        if include_prevention:
+            parts["prevention"] = (
+                normalize_key("prevention", injury_type),
+                {"kind": "prevention", "injury_type": injury_type},
+                partial(self.get_prevention_tips, injury_type, use_cache),
+            )
+        
+        results = {}
+        missing = []
+        for kind, (cache_key, _, _) in parts.items():
+            cached = _guidance_cache.get(cache_key) if use_cache else None
+            if cached is not None:
+                results[kind] = cached
+            else:
+                missing.append(kind)
+        
+        if missing:
+            fetched = _in_flight.do(
+                (self.base_url, "guidance-batch", use_cache) + tuple(parts[kind][0] for kind in missing),
+                partial(self._fetch_guidance_parts, [parts[kind] for kind in missing], use_cache)
+            )
+            results.update(zip(missing, fetched))
+        
+        return GuidanceBundle(**results)
+    
+    def _fetch_guidance_parts(self, parts: List[tuple], use_cache: bool) -> List[Dict[str, Any]]:
+        """Fetch guidance parts from the batch route, or one by one without it, and cache them"""
+        fetched = None
+        if self.base_url not in _batch_unsupported:
+            fetched = self._fetch_guidance_batch([payload for _, payload, _ in parts])
+        if fetched is None:
+            fetched = _call_concurrently([fetch for _, _, fetch in parts])
+        return [
+            self._store_guidance(cache_key, result, use_cache)
+            for (cache_key, _, _), result in zip(parts, fetched)
+        ]
+    
+    def _fetch_guidance_batch(self, items: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Send guidance requests to the batch route
+        
+        Args:
+            items: Request payloads, each with a ``kind``
+        
+        Returns:
+            One response per item in the same order, or None if the backend
+            has no usable batch route (remembered for later calls)
+        """
+        try:
+            response = self._post_json("/first-aid/batch", {"requests": items}, timeout=30)
+            if response.status_code in (404, 405):
+                _batch_unsupported.add(self.base_url)
+                return None
             
             response.raise_for_status()
-            return response.json()
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            results = body.get("results") if isinstance(body, dict) else None
+            if not isinstance(results, list) or len(results) != len(items):
+                _batch_unsupported.add(self.base_url)
+                return None
+            return results
         
+        except requests.exceptions.Timeout:
+            error = {"status": "error", "error": {"message": "Request timeout - backend is slow to respond"}}
+        except requests.exceptions.ConnectionError:
+            error = {"status": "error", "error": {"message": "Could not connect to backend. Is it running on port 8000?"}}
+        except requests.exceptions.HTTPError as e:
+            error = {"status": "error", "error": {"message": f"HTTP Error: {e.response.status_code} - {e.response.text[:200]}"}}
         except Exception as e:
-            return {"error": str(e)}
+            error = {"status": "error", "error": {"message": str(e)}}
+        return [error] * len(items)
     
-    
-    def transcribe_voice_input(self, audio_file_path: str) -> Dict[str, Any]:
+    def transcribe_voice_input(
+        self,
+        audio_file_path: str,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
         """
         Transcribe voice input from audio file
         
+        The file is streamed from disk in chunks rather than loaded whole.
+        
         Args:
             audio_file_path: Path to audio file
+            on_progress: Called with (bytes sent, total bytes) during upload
         
         Returns:
             Transcription result
         """
         try:
             with open(audio_file_path, 'rb') as f:
-                files = {'file': f}
-                response = self.session.post(
-                    f"{self.base_url}/voice-input/transcribe",
-                    files=files,
+                body, headers = multipart_body(
+                    {'file': (os.path.basename(audio_file_path), f)},
+                    on_progress=on_progress
+                )
+                response = self._request(
+                    "POST",
+                    "/voice-input/transcribe",
+                    data=body,
+                    headers=headers,
                     timeout=30
                 )
             
@@ -170,101 +677,153 @@ class APIClient:
         except Exception as e:
             return {"error": str(e)}
     
-    def parse_injury_from_voice(self, transcription: str) -> Dict[str, Any]:
+    def analyze_voice_text(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
         """
-        Parse injury information from voice transcription
+        Analyze a voice transcription in one call
+        
+        Sends the text once as JSON to ``POST /voice-input/analyze`` and
+        gets injury type, severity, emergency flag and body area back
+        together. Results are memoized per transcript. Backends without
+        the route are remembered and answered by the legacy parse-injury
+        route instead, also memoized, so the per-field methods never need
+        the legacy detect-* routes.
         
         Args:
-            transcription: Voice transcribed text
+            text: Voice transcribed text
+            use_cache: Serve and store the result in the shared voice analysis cache
         
         Returns:
-            Parsed injury information
+            Combined analysis result
         """
+        if self.base_url in _voice_analyze_unsupported:
+            return _in_flight.do(
+                (self.base_url, "parse-injury", use_cache, text),
+                partial(self._legacy_voice_analysis, text, use_cache)
+            )
+        
+        cache_key = ("analyze", text)
+        if use_cache:
+            cached = _voice_analysis_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        return _in_flight.do(
+            (self.base_url, use_cache) + cache_key,
+            partial(self._fetch_voice_analysis, text, cache_key, use_cache)
+        )
+    
+    def _fetch_voice_analysis(self, text: str, cache_key: tuple, use_cache: bool) -> Dict[str, Any]:
+        """Request the combined voice analysis from the backend and cache it"""
         try:
-            params = {"transcription": transcription}
-            response = self.session.post(
-                f"{self.base_url}/voice-input/parse-injury",
-                params=params,
-                timeout=10
+            response = self._post_json("/voice-input/analyze", {"text": text}, timeout=10)
+            if response.status_code in (404, 405):
+                _voice_analyze_unsupported.add(self.base_url)
+                return self._legacy_voice_analysis(text, use_cache)
+            
+            response.raise_for_status()
+            result = response.json()
+            if use_cache and not _is_error_result(result):
+                _voice_analysis_cache.set(cache_key, result)
+            return result
+        
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def _legacy_voice_analysis(self, text: str, use_cache: bool) -> Dict[str, Any]:
+        """Analyze voice text with the legacy parse-injury route, memoized per text"""
+        cache_key = ("parse-injury", text)
+        if use_cache:
+            cached = _voice_analysis_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            response = self._post_json(
+                "/voice-input/parse-injury",
+                {"transcription": text},
+                timeout=10,
+                query_fallback=True
             )
             
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+            if use_cache and not _is_error_result(result):
+                _voice_analysis_cache.set(cache_key, result)
+            return result
         
         except Exception as e:
             return {"error": str(e)}
     
+    def parse_injury_from_voice(self, transcription: str) -> Dict[str, Any]:
+        """
+        Parse injury information from voice transcription
+        
+        Args:
+            transcription: Voice transcribed text
+        
+        Returns:
+            Combined analysis dict from ``analyze_voice_text``
+        """
+        return self.analyze_voice_text(transcription)
+    
+    def _voice_field(self, voice_text: str, field: str) -> Dict[str, Any]:
+        """
+        Answer a per-field voice method from the memoized combined analysis
+        
+        Returns ``{field: value}`` (plus ``status`` when the analysis has
+        one), the shape of the single-field routes, or the analysis error
+        unchanged.
+        """
+        analysis = self.analyze_voice_text(voice_text)
+        if _is_error_result(analysis):
+            return analysis
+        result = {field: analysis.get(field)}
+        if "status" in analysis:
+            result["status"] = analysis["status"]
+        return result
+    
     def detect_injury_type_from_voice(self, voice_text: str) -> Dict[str, Any]:
         """
         Detect injury type from voice text
         
+        Served from the memoized ``analyze_voice_text`` result, so asking
+        for several fields of one transcript costs one backend call.
+        
         Args:
             voice_text: Voice transcribed text
         
         Returns:
-            Detected injury type
+            Detected injury type as ``{"injury_type": ...}``
         """
-        try:
-            params = {"voice_text": voice_text}
-            response = self.session.post(
-                f"{self.base_url}/voice-input/detect-injury-type",
-                params=params,
-                timeout=10
-            )
-            
-            response.raise_for_status()
-            return response.json()
-        
-        except Exception as e:
-            return {"error": str(e)}
+        return self._voice_field(voice_text, "injury_type")
     
     def detect_severity_from_voice(self, voice_text: str) -> Dict[str, Any]:
         """
         Detect severity from voice text
         
+        Served from the memoized ``analyze_voice_text`` result.
+        
         Args:
             voice_text: Voice transcribed text
         
         Returns:
-            Detected severity
+            Detected severity as ``{"severity": ...}``
         """
-        try:
-            params = {"voice_text": voice_text}
-            response = self.session.post(
-                f"{self.base_url}/voice-input/detect-severity",
-                params=params,
-                timeout=10
-            )
-            
-            response.raise_for_status()
-            return response.json()
-        
-        except Exception as e:
-            return {"error": str(e)}
+        return self._voice_field(voice_text, "severity")
     
     def detect_emergency_from_voice(self, voice_text: str) -> Dict[str, Any]:
         """
         Detect emergency from voice text
         
+        Served from the memoized ``analyze_voice_text`` result.
+        
         Args:
             voice_text: Voice transcribed text
         
         Returns:
-            Emergency detection result
+            Emergency detection result as ``{"is_emergency": ...}``
         """
-        try:
-            params = {"voice_text": voice_text}
-            response = self.session.post(
-                f"{self.base_url}/voice-input/detect-emergency",
-                params=params,
-                timeout=10
-            )
-            
-            response.raise_for_status()
-            return response.json()
-        
-        except Exception as e:
-            return {"error": str(e)}
+        return self._voice_field(voice_text, "is_emergency")
     
     def get_voice_input_status(self) -> Dict[str, Any]:
         """
@@ -274,8 +833,9 @@ class APIClient:
             Voice input status
         """
         try:
-            response = self.session.get(
-                f"{self.base_url}/voice-input/status",
+            response = self._request(
+                "GET",
+                "/voice-input/status",
                 timeout=10
             )
             
@@ -287,20 +847,208 @@ class APIClient:
     
     def health_check(self) -> bool:
         """
-        Check if backend is available
+        Probe the backend now and update the shared health monitor
+        
+        Renders should read ``health_monitor.is_healthy`` instead, which
+        does no network I/O.
         
         Returns:
             True if backend is healthy
         """
-        try:
-            response = self.session.get(
-                f"{self.base_url}/health",
-                timeout=5
-            )
-            return response.status_code == 200
-        except:
-            return False
+        return self.health_monitor.probe()
     
     def close(self):
         """Close the session"""
         self.session.close()
+
+
+class AsyncAPIClient:
+    """
+    Asyncio client for the backend API with a bounded keep-alive pool
+
+    Exposes the same methods as APIClient as coroutines. Calls run on a
+    worker pool sized to the connection pool, so at most ``pool_size``
+    requests are in flight and every one of them reuses a pooled
+    HTTP/1.1 connection.
+    """
+    
+    def __init__(self, base_url: str = BACKEND_URL, pool_size: int = ASYNC_POOL_SIZE):
+        """
+        Initialize async API client
+        
+        Args:
+            base_url: Base URL of the backend API
+            pool_size: Maximum number of concurrent pooled connections
+        """
+        self.pool_size = max(1, pool_size)
+        self._client = APIClient(base_url)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            pool_block=True
+        )
+        self._client.session.mount("http://", adapter)
+        self._client.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.pool_size,
+            thread_name_prefix="api-client"
+        )
+    
+    @property
+    def base_url(self) -> str:
+        """Base URL of the backend API"""
+        return self._client.base_url
+    
+    async def _call(self, method, *args, **kwargs):
+        """Run a blocking APIClient method on the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(method, *args, **kwargs))
+    
+    async def upload_image(
+        self,
+        image_path: str,
+        age_group: str = None,
+        preprocess: bool = True,
+        use_cache: bool = True,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """Upload and analyze an image"""
+        return await self._call(
+            self._client.upload_image,
+            image_path,
+            age_group=age_group,
+            preprocess=preprocess,
+            use_cache=use_cache,
+            on_progress=on_progress
+        )
+    
+    async def get_first_aid_guidance(
+        self,
+        injury_type: str,
+        severity: str,
+        affected_area: str = None,
+        age_group: str = "adult",
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Get first aid guidance for an injury"""
+        return await self._call(
+            self._client.get_first_aid_guidance,
+            injury_type,
+            severity,
+            affected_area=affected_area,
+            age_group=age_group,
+            use_cache=use_cache
+        )
+    
+    async def get_emergency_guidance(self, injury_type: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Get emergency guidance"""
+        return await self._call(self._client.get_emergency_guidance, injury_type, use_cache=use_cache)
+    
+    async def get_prevention_tips(self, injury_type: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Get prevention tips"""
+        return await self._call(self._client.get_prevention_tips, injury_type, use_cache=use_cache)
+    
+    async def get_guidance_batch(
+        self,
+        injury_type: str,
+        severity: str,
+        affected_area: str = None,
+        age_group: str = "adult",
+        include_emergency: bool = False,
+        include_prevention: bool = False,
+        use_cache: bool = True
+    ) -> GuidanceBundle:
+        """Get guidance for an injury in one round trip"""
+        return await self._call(
+            self._client.get_guidance_batch,
+            injury_type,
+            severity,
+            affected_area=affected_area,
+            age_group=age_group,
+            include_emergency=include_emergency,
+            include_prevention=include_prevention,
+            use_cache=use_cache
+        )
+    
+    async def transcribe_voice_input(
+        self,
+        audio_file_path: str,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """Transcribe voice input from audio file"""
+        return await self._call(self._client.transcribe_voice_input, audio_file_path, on_progress=on_progress)
+    
+    async def analyze_voice_text(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Analyze a voice transcription in one call"""
+        return await self._call(self._client.analyze_voice_text, text, use_cache=use_cache)
+    
+    async def parse_injury_from_voice(self, transcription: str) -> Dict[str, Any]:
+        """Parse injury information from voice transcription; returns the combined analysis dict"""
+        return await self._call(self._client.parse_injury_from_voice, transcription)
+    
+    async def detect_injury_type_from_voice(self, voice_text: str) -> Dict[str, Any]:
+        """Detect injury type from voice text"""
+        return await self._call(self._client.detect_injury_type_from_voice, voice_text)
+    
+    async def detect_severity_from_voice(self, voice_text: str) -> Dict[str, Any]:
+        """Detect severity from voice text"""
+        return await self._call(self._client.detect_severity_from_voice, voice_text)
+    
+    async def detect_emergency_from_voice(self, voice_text: str) -> Dict[str, Any]:
+        """Detect emergency from voice text"""
+        return await self._call(self._client.detect_emergency_from_voice, voice_text)
+    
+    async def get_voice_input_status(self) -> Dict[str, Any]:
+        """Get voice input service status"""
+        return await self._call(self._client.get_voice_input_status)
+    
+    async def health_check(self) -> bool:
+        """Check if backend is available"""
+        return await self._call(self._client.health_check)
+    
+    def gather(self, *calls: Awaitable) -> List[Any]:
+        """
+        Run several client calls concurrently and wait for all of them
+        
+        Meant for Streamlit pages, whose script thread has no running event
+        loop. The total wait is the slowest call rather than the sum.
+        
+        Args:
+            calls: Coroutines returned by this client's methods
+        
+        Returns:
+            Results in the same order as the calls
+        """
+        async def _gather():
+            return await asyncio.gather(*calls)
+        
+        return asyncio.run(_gather())
+    
+    def close(self):
+        """Shut down the worker pool and close pooled connections"""
+        self._executor.shutdown(wait=False)
+        self._client.close()
+
+
+_async_clients: Dict[str, AsyncAPIClient] = {}
+_async_clients_lock = threading.Lock()
+
+
+def get_async_api_client(base_url: str = BACKEND_URL) -> AsyncAPIClient:
+    """
+    Get the process-wide async client for a backend, creating it on first use
+    
+    The client owns a connection pool and a worker pool, so one instance
+    is shared by every session instead of being created per visitor.
+    
+    Args:
+        base_url: Base URL of the backend API
+    
+    Returns:
+        Shared AsyncAPIClient instance
+    """
+    with _async_clients_lock:
+        client = _async_clients.get(base_url)
+        if client is None:
+            client = _async_clients[base_url] = AsyncAPIClient(base_url)
+    return client
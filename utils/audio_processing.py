@@ -0,0 +1,223 @@
+"""
+Vectorized audio analysis helpers for the voice input pipeline
+"""
+import os
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Analysis frame length in milliseconds
+FRAME_MS = 30
+
+# Percentile of frame energies taken as the background noise level
+NOISE_PERCENTILE = 10
+
+# Lowest energy threshold returned, so digital silence does not yield 0
+MIN_ENERGY_THRESHOLD = 50.0
+
+# Voice activity detection: pauses shorter than this stay inside a segment
+VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", "300"))
+
+# Audio kept on either side of detected speech
+VAD_PADDING_MS = int(os.getenv("VAD_PADDING_MS", "150"))
+
+# Segments longer than this are split at their quietest frame
+VAD_MAX_SEGMENT_SECONDS = float(os.getenv("VAD_MAX_SEGMENT_SECONDS", "30"))
+
+# Loud frames (90th percentile) must be this many times the noise floor
+# for a clip to count as having silence to trim (about 10 dB)
+VAD_MIN_DYNAMIC_RANGE = float(os.getenv("VAD_MIN_DYNAMIC_RANGE", "3"))
+
+# If less speech than this is detected, the clip is left untrimmed
+VAD_MIN_SPEECH_SECONDS = float(os.getenv("VAD_MIN_SPEECH_SECONDS", "0.3"))
+
+
+def audio_to_samples(audio_data) -> Tuple[np.ndarray, int]:
+    """
+    Get 16-bit mono samples from SpeechRecognition audio
+
+    Args:
+        audio_data: ``sr.AudioData``
+
+    Returns:
+        Tuple of (int16 sample array, sample rate)
+    """
+    raw = audio_data.get_raw_data(convert_width=2)
+    return np.frombuffer(raw, dtype="<i2"), audio_data.sample_rate
+
+
+def frame_rms(samples: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """
+    Compute the RMS energy of consecutive non-overlapping frames
+
+    A trailing partial frame is ignored; a clip shorter than one frame is
+    treated as a single frame.
+
+    Args:
+        samples: 1-D sample array
+        sample_rate: Samples per second
+        frame_ms: Frame length in milliseconds
+
+    Returns:
+        Array with one RMS value per frame, in sample units
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    frame_count = len(samples) // frame_len
+    if frame_count == 0:
+        frames = samples.reshape(1, -1)
+    else:
+        frames = samples[:frame_count * frame_len].reshape(frame_count, frame_len)
+
+    if frames.size == 0:
+        return np.zeros(0)
+    return np.sqrt(np.square(frames, dtype=np.float64).mean(axis=1))
+
+
+def estimate_vad_threshold(
+    energies: np.ndarray,
+    ratio: float = 1.5,
+    noise_percentile: float = NOISE_PERCENTILE,
+    min_dynamic_range: float = VAD_MIN_DYNAMIC_RANGE
+) -> Optional[float]:
+    """
+    Estimate the frame energy separating speech from silence in a clip
+
+    Takes the quietest frames as the noise floor and scales it the same way
+    ``Recognizer.adjust_for_ambient_noise`` scales ambient energy, without
+    consuming any of the audio. A clip whose loud frames are not clearly
+    above its quiet frames (continuous speech, or uniform noise) has no
+    silence that can be told apart, so no threshold is returned.
+
+    Args:
+        energies: Frame energies from ``frame_rms``
+        ratio: Multiplier over the noise floor
+        noise_percentile: Percentile of frame energies treated as noise
+        min_dynamic_range: Required ratio of loud frames to the noise floor
+
+    Returns:
+        Energy threshold in sample units, or None if the clip should not be trimmed
+    """
+    if energies.size == 0:
+        return None
+    noise_floor = max(float(np.percentile(energies, noise_percentile)), MIN_ENERGY_THRESHOLD / ratio)
+    if float(np.percentile(energies, 90)) < noise_floor * min_dynamic_range:
+        return None
+    return noise_floor * ratio
+
+
+def _split_long_run(start: int, end: int, energies: np.ndarray, max_frames: int) -> Iterator[Tuple[int, int]]:
+    """Split a run of frames longer than max_frames at its quietest frames"""
+    while end - start > max_frames:
+        search_from = start + max_frames // 2
+        cut = search_from + int(np.argmin(energies[search_from:start + max_frames]))
+        yield start, cut
+        start = cut
+    yield start, end
+
+
+def detect_speech_segments(
+    samples: np.ndarray,
+    sample_rate: int,
+    threshold: float,
+    frame_ms: int = FRAME_MS,
+    min_silence_ms: int = VAD_MIN_SILENCE_MS,
+    padding_ms: int = VAD_PADDING_MS,
+    max_segment_seconds: float = VAD_MAX_SEGMENT_SECONDS,
+    energies: Optional[np.ndarray] = None
+) -> List[Tuple[int, int]]:
+    """
+    Find the spans of a clip that contain speech
+
+    Frames above the energy threshold are voiced. Voiced runs separated by
+    less than ``min_silence_ms`` are merged, each span is padded, and spans
+    longer than ``max_segment_seconds`` are split at their quietest frame.
+
+    Args:
+        samples: 1-D sample array
+        sample_rate: Samples per second
+        threshold: Energy threshold in sample units
+        frame_ms: Frame length in milliseconds
+        min_silence_ms: Shortest pause that separates two segments
+        padding_ms: Audio kept before and after each segment
+        max_segment_seconds: Longest segment returned
+        energies: Frame energies already computed with ``frame_rms`` for
+            the same ``frame_ms``; computed here if None
+
+    Returns:
+        List of (start, end) sample indices, in order and non-overlapping
+    """
+    if energies is None:
+        energies = frame_rms(samples, sample_rate, frame_ms)
+    voiced = energies > threshold
+    if not voiced.any():
+        return []
+
+    # Run boundaries: rising edges are starts, falling edges are ends
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+
+    min_gap = max(1, round(min_silence_ms / frame_ms))
+    keep = (starts[1:] - ends[:-1]) >= min_gap
+    starts = np.concatenate((starts[:1], starts[1:][keep]))
+    ends = np.concatenate((ends[:-1][keep], ends[-1:]))
+
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    max_frames = max(1, int(max_segment_seconds * 1000 / frame_ms))
+    padding = int(sample_rate * padding_ms / 1000)
+
+    segments = []
+    previous_end = 0
+    for run_start, run_end in zip(starts.tolist(), ends.tolist()):
+        for start, end in _split_long_run(run_start, run_end, energies, max_frames):
+            start = max(start * frame_len - padding, previous_end)
+            end = min(end * frame_len + padding, len(samples))
+            segments.append((start, end))
+            previous_end = end
+    return segments
+
+
+def group_segments(
+    segments: List[Tuple[int, int]],
+    sample_rate: int,
+    max_seconds: float = VAD_MAX_SEGMENT_SECONDS
+) -> List[List[Tuple[int, int]]]:
+    """
+    Pack consecutive segments into chunks of at most ``max_seconds`` of speech
+
+    Keeps the number of engine calls low when speech has many short pauses.
+
+    Args:
+        segments: (start, end) sample indices, in order
+        sample_rate: Samples per second
+        max_seconds: Longest chunk, counting only the segments' own audio
+
+    Returns:
+        List of chunks, each a list of segments
+    """
+    max_samples = int(max_seconds * sample_rate)
+    chunks: List[List[Tuple[int, int]]] = []
+    chunk_samples = 0
+    for start, end in segments:
+        if chunks and chunk_samples + (end - start) <= max_samples:
+            chunks[-1].append((start, end))
+            chunk_samples += end - start
+        else:
+            chunks.append([(start, end)])
+            chunk_samples = end - start
+    return chunks
+
+
+def removed_seconds(segments: List[Tuple[int, int]], total_samples: int, sample_rate: int) -> float:
+    """
+    Seconds of audio left out of the given segments
+
+    Args:
+        segments: (start, end) sample indices
+        total_samples: Length of the full clip
+        sample_rate: Samples per second
+
+    Returns:
+        Duration not covered by any segment
+    """
+    kept = sum(end - start for start, end in segments)
+    return (total_samples - kept) / sample_rate
@@ -0,0 +1,210 @@
+"""
+In-memory TTL + LRU cache shared across Streamlit sessions
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def normalize_key(*parts: Any) -> Tuple[str, ...]:
+    """
+    Build a cache key that ignores case and surrounding/repeated whitespace
+
+    Args:
+        *parts: Key components; None becomes an empty string
+
+    Returns:
+        Normalized key tuple
+    """
+    return tuple(
+        " ".join(str(part).split()).lower() if part is not None else ""
+        for part in parts
+    )
+
+
+def content_digest(data: bytes) -> str:
+    """
+    Content address for a blob of bytes
+
+    Args:
+        data: Raw bytes, e.g. an uploaded file
+
+    Returns:
+        Hex BLAKE2b digest (128-bit)
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Content address of a file, read in chunks
+
+    Args:
+        path: File path
+        chunk_size: Bytes read at a time
+
+    Returns:
+        Hex BLAKE2b digest (128-bit), equal to ``content_digest`` of the contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TTLCache:
+    """
+    Thread-safe cache with per-entry expiry and least-recently-used eviction
+
+    Entries older than ``ttl`` seconds are treated as misses and dropped.
+    When ``max_entries`` is reached the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum number of entries kept
+            ttl: Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None on a miss
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with size, hits, misses and evictions
+        """
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one
+
+    The first caller for a key runs the function; callers arriving while
+    it runs wait and receive the same result, or the same exception.
+    Nothing is kept once the call finishes, so this complements a cache
+    rather than replacing it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, list] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for the in-flight call with the same key
+
+        Args:
+            key: Identifies equivalent calls
+            fn: Function to run if no call with this key is in flight
+
+        Returns:
+            The function's result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                # [done event, result, exception]
+                call = self._calls[key] = [threading.Event(), None, None]
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            call[0].wait()
+            if call[2] is not None:
+                raise call[2]
+            return call[1]
+
+        try:
+            call[1] = fn()
+        except BaseException as e:
+            call[2] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call[0].set()
+        return call[1]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters
+
+        Returns:
+            Dictionary with in-flight keys, calls made and calls shared
+        """
+        with self._lock:
+            return {"in_flight": len(self._calls), "calls": self.calls, "shared": self.shared}
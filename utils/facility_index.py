@@ -0,0 +1,357 @@
+"""
+Local spatial index of medical facilities for radius and nearest queries
+"""
+import csv
+import logging
+import math
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from frontend.utils.geo import haversine_km, nearest_order
+
+logger = logging.getLogger(__name__)
+
+# CSV dump or OSM/Overpass XML extract of facilities; empty disables the index
+FACILITY_DATA_PATH = os.getenv("FACILITY_DATA_PATH", "")
+
+# Grid cell size in degrees (0.05 deg is about 5.5 km of latitude)
+FACILITY_GRID_CELL_DEG = float(os.getenv("FACILITY_GRID_CELL_DEG", "0.05"))
+
+# Seconds between checks of the data file for changes
+FACILITY_REFRESH_INTERVAL = float(os.getenv("FACILITY_REFRESH_INTERVAL", "60"))
+
+KM_PER_DEG_LAT = 111.32
+
+# OSM tags that mark a medical facility
+OSM_FACILITY_TAGS = {
+    "amenity": {"hospital", "clinic", "doctors"},
+    "healthcare": {"hospital", "clinic", "doctor", "centre"},
+}
+
+# Errors raised by a malformed or half-written data file
+_PARSE_ERRORS = (csv.Error, ET.ParseError, ValueError, TypeError, KeyError)
+
+# CSV column aliases
+_LATITUDE_COLUMNS = ("latitude", "lat")
+_LONGITUDE_COLUMNS = ("longitude", "lon", "lng")
+
+
+def _facility(name: str, latitude: float, longitude: float, **fields: Any) -> Dict[str, Any]:
+    """Build a facility dict in the shape the hospital locator returns"""
+    facility = {key: value for key, value in fields.items() if value}
+    facility.update({
+        "name": name or "Unknown",
+        "latitude": latitude,
+        "longitude": longitude,
+        "google_maps_url": f"https://www.google.com/maps/search/?api=1&query={latitude},{longitude}",
+        "osm_url": f"https://www.openstreetmap.org/?mlat={latitude}&mlon={longitude}#map=17/{latitude}/{longitude}",
+    })
+    return facility
+
+
+def load_facilities_csv(path: str) -> List[Dict[str, Any]]:
+    """
+    Load facilities from a CSV dump
+
+    Requires name and latitude/longitude (or lat/lon/lng) columns. The type,
+    phone, opening_hours, operator and website columns are used if present.
+
+    Args:
+        path: CSV file path
+
+    Returns:
+        List of facility dicts
+    """
+    facilities = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            row = {key.strip().lower(): (value or "").strip() for key, value in row.items() if key}
+            lat = next((row[c] for c in _LATITUDE_COLUMNS if row.get(c)), None)
+            lon = next((row[c] for c in _LONGITUDE_COLUMNS if row.get(c)), None)
+            if lat is None or lon is None:
+                continue
+            try:
+                latitude, longitude = float(lat), float(lon)
+            except ValueError:
+                continue
+            facilities.append(_facility(
+                row.get("name", ""),
+                latitude,
+                longitude,
+                type=row.get("type"),
+                phone=row.get("phone"),
+                opening_hours=row.get("opening_hours"),
+                operator=row.get("operator"),
+                website=row.get("website"),
+            ))
+    return facilities
+
+
+def load_facilities_osm(path: str) -> List[Dict[str, Any]]:
+    """
+    Load facilities from an OSM XML extract
+
+    Uses nodes tagged as medical facilities, and ways/relations that carry a
+    <center> element (Overpass ``out center`` output).
+
+    Args:
+        path: .osm / .xml file path
+
+    Returns:
+        List of facility dicts
+    """
+    facilities = []
+    for _, element in ET.iterparse(path, events=("end",)):
+        if element.tag not in ("node", "way", "relation"):
+            continue
+
+        tags = {tag.get("k"): tag.get("v") for tag in element.findall("tag")}
+        facility_type = None
+        for key, values in OSM_FACILITY_TAGS.items():
+            if tags.get(key) in values:
+                facility_type = tags[key]
+                break
+        if facility_type:
+            point = element if element.tag == "node" else element.find("center")
+            if point is not None and point.get("lat") and point.get("lon"):
+                facilities.append(_facility(
+                    tags.get("name", ""),
+                    float(point.get("lat")),
+                    float(point.get("lon")),
+                    type=facility_type.capitalize(),
+                    phone=tags.get("phone") or tags.get("contact:phone"),
+                    opening_hours=tags.get("opening_hours"),
+                    operator=tags.get("operator"),
+                    website=tags.get("website") or tags.get("contact:website"),
+                ))
+        element.clear()
+    return facilities
+
+
+def load_facilities(path: str) -> List[Dict[str, Any]]:
+    """Load facilities from a CSV or OSM XML file, chosen by extension"""
+    if path.lower().endswith(".csv"):
+        return load_facilities_csv(path)
+    return load_facilities_osm(path)
+
+
+class FacilityIndex:
+    """
+    Uniform latitude/longitude grid over a local facility list
+
+    Coordinates are held in NumPy arrays and each grid cell maps to an
+    array of facility indices, so a query gathers the candidates from the
+    cells that can contain a match and ranks them in one vectorized batch.
+    The facility list, arrays and grid are swapped in as one snapshot on
+    reload, so queries running on other threads never see a half-built
+    index.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cell_deg: float = FACILITY_GRID_CELL_DEG,
+        refresh_interval: float = FACILITY_REFRESH_INTERVAL
+    ):
+        """
+        Initialize and load the index
+
+        Args:
+            path: CSV or OSM XML data file
+            cell_deg: Grid cell size in degrees
+            refresh_interval: Seconds between checks of the file for changes
+        """
+        self.path = path
+        self.cell_deg = cell_deg
+        self.refresh_interval = refresh_interval
+        self._reload_lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self._snapshot = ([], {}, np.zeros(0), np.zeros(0))
+        self.reload()
+
+    def __len__(self) -> int:
+        return len(self._snapshot[0])
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (math.floor(latitude / self.cell_deg), math.floor(longitude / self.cell_deg))
+
+    def reload(self):
+        """Rebuild the index from the data file and swap it in"""
+        with self._reload_lock:
+            mtime = os.path.getmtime(self.path)
+            facilities = load_facilities(self.path)
+            lats = np.array([facility["latitude"] for facility in facilities], dtype=np.float64)
+            lons = np.array([facility["longitude"] for facility in facilities], dtype=np.float64)
+
+            rows = np.floor(lats / self.cell_deg).astype(np.int64).tolist()
+            cols = np.floor(lons / self.cell_deg).astype(np.int64).tolist()
+            cells: Dict[Tuple[int, int], List[int]] = {}
+            for index, cell in enumerate(zip(rows, cols)):
+                cells.setdefault(cell, []).append(index)
+            grid = {cell: np.array(indices, dtype=np.intp) for cell, indices in cells.items()}
+
+            self._snapshot = (facilities, grid, lats, lons)
+            self._mtime = mtime
+            self._checked_at = time.monotonic()
+
+    def refresh_if_changed(self):
+        """
+        Reload if the data file changed, checking at most every refresh_interval
+
+        A file that cannot be read or parsed (for example one still being
+        written) is logged and skipped: the previous snapshot keeps serving
+        queries and the file is tried again once its mtime changes.
+        """
+        if time.monotonic() - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = time.monotonic()
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime != self._mtime:
+                self.reload()
+        except OSError:
+            pass
+        except _PARSE_ERRORS as e:
+            logger.warning(
+                "Could not reload facility data from %s, keeping %d facilities: %s",
+                self.path, len(self), e
+            )
+            self._mtime = mtime
+
+    def _ring_cells(self, latitude: float, longitude: float, ring: int) -> List[Tuple[int, int]]:
+        """Grid cells on the square ring at distance ``ring`` around a point"""
+        row, col = self._cell(latitude, longitude)
+        if ring == 0:
+            return [(row, col)]
+
+        cells = []
+        for c in range(col - ring, col + ring + 1):
+            cells.extend(((row - ring, c), (row + ring, c)))
+        for r in range(row - ring + 1, row + ring):
+            cells.extend(((r, col - ring), (r, col + ring)))
+        return cells
+
+    @staticmethod
+    def _gather(grid, cells) -> np.ndarray:
+        """Concatenate the facility indices of the given cells"""
+        arrays = [grid[cell] for cell in cells if cell in grid]
+        if not arrays:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(arrays)
+
+    @staticmethod
+    def _results(facilities, candidates: np.ndarray, distances: np.ndarray, top_k: Optional[int]) -> List[Dict[str, Any]]:
+        """Build facility dicts with distance_km for the nearest candidates"""
+        results = []
+        for position in nearest_order(distances, top_k).tolist():
+            facility = dict(facilities[candidates[position]])
+            facility["distance_km"] = round(float(distances[position]), 2)
+            results.append(facility)
+        return results
+
+    def query_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find facilities within a radius, nearest first
+
+        Args:
+            latitude: Search centre latitude
+            longitude: Search centre longitude
+            radius_km: Search radius in kilometres
+            top_k: Return at most this many facilities
+
+        Returns:
+            Facility dicts with distance_km
+        """
+        self.refresh_if_changed()
+        facilities, grid, lats, lons = self._snapshot
+
+        lat_cells = math.ceil(radius_km / KM_PER_DEG_LAT / self.cell_deg)
+        km_per_deg_lon = KM_PER_DEG_LAT * max(math.cos(math.radians(latitude)), 1e-6)
+        lon_cells = math.ceil(radius_km / km_per_deg_lon / self.cell_deg)
+
+        row, col = self._cell(latitude, longitude)
+        candidates = self._gather(grid, (
+            (r, c)
+            for r in range(row - lat_cells, row + lat_cells + 1)
+            for c in range(col - lon_cells, col + lon_cells + 1)
+        ))
+
+        distances = haversine_km(latitude, longitude, lats[candidates], lons[candidates])
+        within = distances <= radius_km
+        return self._results(facilities, candidates[within], distances[within], top_k)
+
+    def query_nearest(self, latitude: float, longitude: float, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find the k nearest facilities
+
+        Searches outward ring by ring until no unvisited cell can hold
+        anything closer than the k-th result. Once the rings span more
+        cells than the grid has occupied, every facility is scanned instead.
+
+        Args:
+            latitude: Search centre latitude
+            longitude: Search centre longitude
+            k: Number of facilities to return
+
+        Returns:
+            Facility dicts with distance_km, nearest first
+        """
+        self.refresh_if_changed()
+        facilities, grid, lats, lons = self._snapshot
+        if not facilities or k <= 0:
+            return []
+
+        # Shortest distance covered by one ring of cells at this latitude
+        ring_km = self.cell_deg * KM_PER_DEG_LAT * max(math.cos(math.radians(latitude)), 1e-6)
+
+        found_candidates, found_distances = [], []
+        ring = 0
+        while (2 * ring + 1) ** 2 <= len(grid):
+            candidates = self._gather(grid, self._ring_cells(latitude, longitude, ring))
+            found_candidates.append(candidates)
+            found_distances.append(haversine_km(latitude, longitude, lats[candidates], lons[candidates]))
+
+            distances = np.concatenate(found_distances)
+            if len(distances) >= k and np.partition(distances, k - 1)[k - 1] <= ring * ring_km:
+                return self._results(facilities, np.concatenate(found_candidates), distances, k)
+            ring += 1
+
+        candidates = np.arange(len(facilities))
+        return self._results(facilities, candidates, haversine_km(latitude, longitude, lats, lons), k)
+
+
+_facility_index: Optional[FacilityIndex] = None
+_facility_index_lock = threading.Lock()
+
+
+def get_facility_index() -> Optional[FacilityIndex]:
+    """
+    Get the process-wide facility index, loading it on first use
+
+    Returns:
+        Shared FacilityIndex, or None if FACILITY_DATA_PATH is not configured
+        or could not be loaded yet (tried again on the next call)
+    """
+    global _facility_index
+    if not FACILITY_DATA_PATH or not os.path.exists(FACILITY_DATA_PATH):
+        return None
+    with _facility_index_lock:
+        if _facility_index is None:
+            try:
+                _facility_index = FacilityIndex(FACILITY_DATA_PATH)
+            except (OSError,) + _PARSE_ERRORS as e:
+                logger.warning("Could not load facility data from %s: %s", FACILITY_DATA_PATH, e)
+                return None
+    return _facility_index
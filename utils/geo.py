@@ -0,0 +1,162 @@
+"""
+Vectorized geographic distance and ranking helpers
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Web Mercator ground resolution at the equator at zoom 0, in metres per pixel
+METRES_PER_PIXEL_Z0 = 156543.03
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Great-circle distances from one point to many, in kilometres
+
+    Args:
+        lat: Origin latitude in degrees
+        lon: Origin longitude in degrees
+        lats: Array of latitudes in degrees
+        lons: Array of longitudes in degrees
+
+    Returns:
+        Array of distances, same shape as lats
+    """
+    phi1 = np.radians(lat)
+    phi2 = np.radians(lats)
+    dphi = phi2 - phi1
+    dlambda = np.radians(lons) - np.radians(lon)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def nearest_order(distances: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+    """
+    Indices that sort distances ascending, optionally only the first top_k
+
+    Uses a partial sort (argpartition) when only the top_k are needed.
+
+    Args:
+        distances: Array of distances
+        top_k: Number of nearest entries to return; None for all
+
+    Returns:
+        Array of indices into distances, nearest first
+    """
+    if top_k is not None and top_k < len(distances):
+        if top_k <= 0:
+            return np.empty(0, dtype=np.intp)
+        nearest = np.argpartition(distances, top_k - 1)[:top_k]
+        return nearest[np.argsort(distances[nearest], kind="stable")]
+    return np.argsort(distances, kind="stable")
+
+
+def coordinate_arrays(facilities: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Extract coordinates from facility dicts into columnar arrays
+
+    Args:
+        facilities: Facility dicts with latitude/longitude keys
+
+    Returns:
+        Tuple of (indices of facilities with coordinates, latitudes, longitudes)
+    """
+    indices, lats, lons = [], [], []
+    for index, facility in enumerate(facilities):
+        try:
+            lat, lon = float(facility["latitude"]), float(facility["longitude"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        indices.append(index)
+        lats.append(lat)
+        lons.append(lon)
+    return np.array(indices, dtype=np.intp), np.array(lats), np.array(lons)
+
+
+def rank_facilities(
+    facilities: List[Dict[str, Any]],
+    lat: float,
+    lon: float,
+    radius_km: Optional[float] = None,
+    top_k: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Compute distance_km for every facility in one batch and sort nearest first
+
+    Facilities without coordinates keep their original order after the
+    ranked ones (and are dropped when a radius is given).
+
+    Args:
+        facilities: Facility dicts with latitude/longitude keys
+        lat: Origin latitude
+        lon: Origin longitude
+        radius_km: Drop facilities farther than this
+        top_k: Return at most this many facilities
+
+    Returns:
+        New facility dicts with distance_km, nearest first
+    """
+    indices, lats, lons = coordinate_arrays(facilities)
+    distances = haversine_km(lat, lon, lats, lons)
+
+    if radius_km is not None:
+        within = distances <= radius_km
+        indices, distances = indices[within], distances[within]
+
+    ranked = []
+    for position in nearest_order(distances, top_k).tolist():
+        facility = dict(facilities[indices[position]])
+        facility["distance_km"] = round(float(distances[position]), 2)
+        ranked.append(facility)
+
+    if radius_km is None and (top_k is None or len(ranked) < top_k):
+        located = set(indices.tolist())
+        unlocated = [facility for index, facility in enumerate(facilities) if index not in located]
+        ranked.extend(unlocated[:None if top_k is None else top_k - len(ranked)])
+    return ranked
+
+
+def cluster_points(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    zoom: float,
+    cell_px: float = 40
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merge points that would overlap on a map at the given zoom level
+
+    Points are binned on a grid whose cells span ``cell_px`` screen pixels
+    at that zoom; each occupied cell becomes one point at the mean of its
+    members.
+
+    Args:
+        lats: Array of latitudes in degrees
+        lons: Array of longitudes in degrees
+        zoom: Web map zoom level
+        cell_px: Grid cell size in screen pixels
+
+    Returns:
+        Tuple of (cluster latitudes, cluster longitudes, member counts)
+    """
+    if len(lats) == 0:
+        return lats, lons, np.zeros(0, dtype=np.intp)
+
+    lon_cell = cell_px * 360.0 / (256 * 2 ** zoom)
+    lat_cell = lon_cell * max(np.cos(np.radians(float(np.mean(lats)))), 1e-6)
+    rows = np.floor(lats / lat_cell).astype(np.int64)
+    cols = np.floor(lons / lon_cell).astype(np.int64)
+    cells = (rows - rows.min()) * (int(cols.max() - cols.min()) + 1) + (cols - cols.min())
+
+    _, inverse, counts = np.unique(cells, return_inverse=True, return_counts=True)
+    return (
+        np.bincount(inverse, weights=lats) / counts,
+        np.bincount(inverse, weights=lons) / counts,
+        counts,
+    )
+
+
+def pixel_metres(lat: float, zoom: float) -> float:
+    """Ground distance covered by one screen pixel at a latitude and zoom level"""
+    return METRES_PER_PIXEL_Z0 * np.cos(np.radians(lat)) / 2 ** zoom
@@ -0,0 +1,186 @@
+"""
+Persistent geocoding cache shared across sessions and restarts
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple, Dict
+
+from frontend.utils.cache import TTLCache
+
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", os.path.join("cache", "geocode.sqlite3"))
+
+# Seconds a geocoded address stays valid (30 days)
+GEOCODE_CACHE_TTL = float(os.getenv("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))
+
+# Maximum number of addresses kept on disk; least recently used go first
+GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "10000"))
+
+# Hot addresses kept in memory in front of SQLite
+GEOCODE_MEMORY_ENTRIES = int(os.getenv("GEOCODE_MEMORY_ENTRIES", "1024"))
+
+
+def normalize_address(address: str) -> str:
+    """
+    Normalize an address so trivially different spellings share a cache entry
+
+    Lowercases, collapses whitespace, normalizes spacing around commas and
+    drops trailing punctuation.
+
+    Args:
+        address: Address as typed by the user
+
+    Returns:
+        Normalized address
+    """
+    address = " ".join(address.lower().split())
+    address = re.sub(r"\s*,\s*", ", ", address)
+    return address.strip(" ,.;")
+
+
+class GeocodeCache:
+    """
+    SQLite-backed address -> coordinates cache with TTL and size limits
+
+    Lookups go to an in-memory TTLCache first and fall back to SQLite, so
+    repeat lookups for hot addresses never leave the process.
+    """
+
+    def __init__(
+        self,
+        path: str = GEOCODE_CACHE_PATH,
+        ttl: float = GEOCODE_CACHE_TTL,
+        max_entries: int = GEOCODE_CACHE_MAX_ENTRIES,
+        memory_entries: int = GEOCODE_MEMORY_ENTRIES
+    ):
+        """
+        Initialize geocode cache
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds an entry stays valid
+            max_entries: Maximum number of entries kept on disk
+            memory_entries: Maximum number of entries kept in memory
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory = TTLCache(max_entries=memory_entries, ttl=ttl)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocode (
+                address TEXT PRIMARY KEY,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS geocode_accessed ON geocode (accessed_at)")
+
+    def get(self, address: str) -> Optional[Tuple[float, float]]:
+        """
+        Look up cached coordinates
+
+        Args:
+            address: Address as typed by the user
+
+        Returns:
+            (latitude, longitude) or None on a miss
+        """
+        key = normalize_address(address)
+        coords = self._memory.get(key)
+        if coords is not None:
+            return coords
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT latitude, longitude, created_at FROM geocode WHERE address = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            latitude, longitude, created_at = row
+            if now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM geocode WHERE address = ?", (key,))
+                return None
+
+            self._conn.execute("UPDATE geocode SET accessed_at = ? WHERE address = ?", (now, key))
+
+        coords = (latitude, longitude)
+        self._memory.set(key, coords)
+        return coords
+
+    def set(self, address: str, coords: Tuple[float, float]):
+        """
+        Store coordinates for an address
+
+        Args:
+            address: Address as typed by the user
+            coords: (latitude, longitude)
+        """
+        key = normalize_address(address)
+        latitude, longitude = float(coords[0]), float(coords[1])
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?)",
+                (key, latitude, longitude, now, now)
+            )
+            self._prune()
+
+        self._memory.set(key, (latitude, longitude))
+
+    def _prune(self):
+        """Drop expired entries and the least recently used beyond max_entries"""
+        self._conn.execute("DELETE FROM geocode WHERE created_at < ?", (time.time() - self.ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM geocode WHERE address IN "
+                "(SELECT address FROM geocode ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with disk size and in-memory hit/miss counters
+        """
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()
+        stats = self._memory.stats()
+        stats["disk_size"] = count
+        return stats
+
+
+_geocode_cache: Optional[GeocodeCache] = None
+_geocode_cache_lock = threading.Lock()
+
+
+def get_geocode_cache() -> GeocodeCache:
+    """
+    Get the process-wide geocode cache, opening it on first use
+
+    Returns:
+        Shared GeocodeCache instance
+    """
+    global _geocode_cache
+    with _geocode_cache_lock:
+        if _geocode_cache is None:
+            _geocode_cache = GeocodeCache()
+    return _geocode_cache
@@ -0,0 +1,173 @@
+"""
+Background health monitor for the backend API
+"""
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import requests
+
+# Seconds between background /health probes
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "15"))
+
+# Timeout for a single /health probe
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+
+
+class HealthMonitor:
+    """
+    Polls the backend /health endpoint on a background thread
+
+    Renders read the last known state through ``is_healthy`` and ``age``
+    without doing any network I/O. API calls report their outcome through
+    ``mark_healthy`` / ``mark_unhealthy`` so a failed request flips the
+    state immediately instead of waiting for the next probe.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        interval: float = HEALTH_CHECK_INTERVAL,
+        timeout: float = HEALTH_CHECK_TIMEOUT
+    ):
+        """
+        Initialize health monitor
+
+        Args:
+            base_url: Base URL of the backend API
+            interval: Seconds between background probes
+            timeout: Timeout for a single probe
+        """
+        self.base_url = base_url
+        self.interval = interval
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._healthy: Optional[bool] = None
+        self._last_checked: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    def start(self):
+        """Probe once synchronously, then keep polling in the background"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._stop,),
+                name="backend-health-monitor",
+                daemon=True
+            )
+
+        self.probe()
+        self._thread.start()
+
+    def stop(self):
+        """Stop background polling"""
+        self._stop.set()
+        with self._lock:
+            self._thread = None
+
+    def _run(self, stop: threading.Event):
+        """Background polling loop"""
+        while not stop.wait(self.interval):
+            self.probe()
+
+    def probe(self) -> bool:
+        """
+        Check the /health endpoint now and record the result
+
+        Returns:
+            True if backend is healthy
+        """
+        try:
+            response = self._session.get(
+                f"{self.base_url}/health",
+                timeout=self.timeout
+            )
+            if response.status_code == 200:
+                self.mark_healthy()
+            else:
+                self.mark_unhealthy(f"HTTP {response.status_code}")
+        except Exception as e:
+            self.mark_unhealthy(str(e))
+
+        return bool(self._healthy)
+
+    def mark_healthy(self):
+        """Record a successful backend response"""
+        with self._lock:
+            self._healthy = True
+            self._last_checked = time.monotonic()
+            self._last_error = None
+
+    def mark_unhealthy(self, reason: str = None):
+        """
+        Record a failed backend response
+
+        Args:
+            reason: Short description of the failure
+        """
+        with self._lock:
+            self._healthy = False
+            self._last_checked = time.monotonic()
+            self._last_error = reason
+
+    @property
+    def is_healthy(self) -> bool:
+        """Last known backend state; unknown counts as healthy"""
+        return self._healthy is not False
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the state was last updated, or None if never checked"""
+        if self._last_checked is None:
+            return None
+        return time.monotonic() - self._last_checked
+
+    @property
+    def last_error(self) -> Optional[str]:
+        """Reason for the last failure, if the backend is unhealthy"""
+        return self._last_error
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current state
+
+        Returns:
+            Dictionary with healthy flag, state age and last error
+        """
+        with self._lock:
+            return {
+                "healthy": self._healthy,
+                "age": self.age,
+                "last_error": self._last_error,
+            }
+
+
+_monitors: Dict[str, HealthMonitor] = {}
+_monitors_lock = threading.Lock()
+
+
+def get_health_monitor(base_url: str) -> HealthMonitor:
+    """
+    Get the process-wide health monitor for a backend, starting it if needed
+
+    Args:
+        base_url: Base URL of the backend API
+
+    Returns:
+        Shared HealthMonitor instance
+    """
+    with _monitors_lock:
+        monitor = _monitors.get(base_url)
+        if monitor is None:
+            monitor = HealthMonitor(base_url)
+            _monitors[base_url] = monitor
+
+    monitor.start()
+    return monitor
@@ -0,0 +1,121 @@
+"""
+Image preprocessing before upload to the analysis backend
+"""
+import io
+import mimetypes
+import os
+from typing import Any, Dict, Tuple, Union
+
+from PIL import Image, ImageOps
+
+# Longest side, in pixels, of images sent for analysis
+IMAGE_MAX_DIMENSION = int(os.getenv("IMAGE_MAX_DIMENSION", "1600"))
+
+# Upload encoding: "JPEG" or "WEBP"
+IMAGE_UPLOAD_FORMAT = os.getenv("IMAGE_UPLOAD_FORMAT", "JPEG").upper()
+
+# Encoder quality, 1-95
+IMAGE_UPLOAD_QUALITY = int(os.getenv("IMAGE_UPLOAD_QUALITY", "85"))
+
+# Image.info keys that carry metadata which must not leave the device
+_METADATA_KEYS = ("exif", "icc_profile", "xmp", "XML:com.adobe.xmp")
+
+_FORMAT_INFO = {
+    "JPEG": (".jpg", "image/jpeg"),
+    "WEBP": (".webp", "image/webp"),
+}
+
+
+def prepare_image(
+    source: Union[bytes, str],
+    max_dimension: int = IMAGE_MAX_DIMENSION,
+    image_format: str = IMAGE_UPLOAD_FORMAT,
+    quality: int = IMAGE_UPLOAD_QUALITY
+) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Downscale and re-encode an image for upload
+
+    JPEG sources are decoded at reduced scale with ``Image.draft`` so a
+    large phone photo is never fully decoded, then ``thumbnail`` brings
+    the longest side down to ``max_dimension``. EXIF orientation is
+    applied to the pixels and all metadata is dropped on re-encode.
+    An image that needed no resizing is sent as-is, in its own format,
+    when re-encoding would not make it smaller and it carries no EXIF,
+    ICC or XMP metadata (so no location and no orientation tag).
+
+    Args:
+        source: Encoded image bytes or an image file path
+        max_dimension: Longest side of the output, in pixels
+        image_format: "JPEG" or "WEBP"
+        quality: Encoder quality
+
+    Returns:
+        Tuple of (encoded bytes, info dict with format, extension,
+        content_type, original/sent byte counts, pixel sizes and whether
+        the image was re-encoded)
+
+    Raises:
+        ValueError: If the output format is not supported
+        OSError: If the image cannot be decoded
+    """
+    if image_format not in _FORMAT_INFO:
+        raise ValueError(f"Unsupported upload format: {image_format}")
+    extension, content_type = _FORMAT_INFO[image_format]
+
+    if isinstance(source, str):
+        original_bytes = os.path.getsize(source)
+        stream = source
+    else:
+        original_bytes = len(source)
+        stream = io.BytesIO(source)
+
+    with Image.open(stream) as image:
+        original_size = image.size
+        original_format = image.format
+        has_metadata = len(image.getexif()) > 0 or any(key in image.info for key in _METADATA_KEYS)
+        # draft() only scales down while both sides stay at least the
+        # requested size, so ask for the final aspect-preserving size
+        scale = min(1.0, max_dimension / max(original_size))
+        image.draft("RGB", (int(original_size[0] * scale), int(original_size[1] * scale)))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+        if image_format == "JPEG" or image.mode not in ("RGB", "RGBA"):
+            # Flatten transparency onto white; JPEG has no alpha channel
+            has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+            if has_alpha:
+                rgba = image.convert("RGBA")
+                image = Image.new("RGB", rgba.size, (255, 255, 255))
+                image.paste(rgba, mask=rgba.getchannel("A"))
+            else:
+                image = image.convert("RGB")
+
+        output = io.BytesIO()
+        image.save(output, format=image_format, quality=quality, optimize=True)
+        sent_size = image.size
+
+    encoded = output.getvalue()
+    reencoded = True
+    original_type = Image.MIME.get(original_format or "")
+    if scale == 1.0 and len(encoded) >= original_bytes and original_type and not has_metadata:
+        # Re-encoding only added bytes; the original is small enough as-is
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                encoded = f.read()
+        else:
+            encoded = bytes(source)
+        image_format, content_type = original_format, original_type
+        extension = mimetypes.guess_extension(original_type) or f".{original_format.lower()}"
+        sent_size = original_size
+        reencoded = False
+
+    return encoded, {
+        "format": image_format,
+        "extension": extension,
+        "content_type": content_type,
+        "original_bytes": original_bytes,
+        "sent_bytes": len(encoded),
+        "original_size": original_size,
+        "sent_size": sent_size,
+        "reencoded": reencoded,
+    }
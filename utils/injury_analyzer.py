@@ -0,0 +1,235 @@
+"""
+Single-pass keyword analyzer for injury descriptions
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; the compiled regex is used instead
+    ahocorasick = None
+
+# Injury categories in priority order; the first category with a match wins
+INJURY_KEYWORDS = {
+    "Cuts and Wounds": ["cut", "wound", "bleeding", "laceration", "slice", "gash", "slash"],
+    "Burns": ["burn", "burnt", "scorched", "heat", "fire", "hot", "scalded"],
+    "Fractures": ["fracture", "broken", "break", "crack", "snapped", "fractured"],
+    "Head Injury": ["head", "concussion", "impact", "knocked", "hit head", "brain"],
+    "Shock": ["shock", "shocked", "pale", "weak", "faint"],
+    "Allergic Reaction": ["allergy", "allergic", "reaction", "rash", "swelling", "itching"],
+    "Severe Bleeding": ["severe bleed", "heavy bleed", "gushing", "hemorrhage", "arterial"],
+    "Choking": ["choking", "choke", "can't breath", "stuck", "blocking", "lodged"],
+    "Poisoning": ["poison", "toxic", "ingested", "swallowed", "overdose"],
+}
+DEFAULT_INJURY_TYPE = "General Injury"
+
+# Severity levels in priority order
+SEVERITY_KEYWORDS = {
+    "Severe": ["severe", "very bad", "critical", "emergency", "urgent", "extremely", "seriously", "terrible"],
+    "Moderate": ["moderate", "bad", "significant", "serious", "quite bad", "fairly bad"],
+    "Mild": ["mild", "minor", "small", "light", "little", "slight", "barely"],
+}
+DEFAULT_SEVERITY = "Moderate"
+
+# Body areas in priority order
+BODY_AREAS = [
+    "head", "face", "eye", "eyes", "nose", "mouth", "ear", "ears",
+    "neck", "shoulder", "shoulders", "arm", "arms", "elbow", "elbows",
+    "hand", "hands", "finger", "fingers", "chest", "back", "torso",
+    "abdomen", "belly", "stomach", "leg", "legs", "knee", "knees",
+    "ankle", "ankles", "foot", "feet", "toe", "toes", "skin", "wrist", "wrists"
+]
+
+EMERGENCY_KEYWORDS = [
+    "emergency", "urgent", "critical", "severe", "call 911",
+    "unconscious", "not breathing", "no pulse", "bleeding heavily",
+    "choking", "poisoned", "overdose", "heart attack", "stroke",
+    "unresponsive", "can't breathe", "difficulty breathing", "severe pain",
+    "loss of consciousness", "suicidal", "bleeding won't stop"
+]
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end] is not preceded or followed by a word character"""
+    return (
+        (start == 0 or not _WORD_CHAR.match(text, start - 1))
+        and (end == len(text) or not _WORD_CHAR.match(text, end))
+    )
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build a regex alternation shaped like a trie of the keywords
+
+    Shared prefixes are matched once and optional tails are greedy, so the
+    regex always reports the longest keyword starting at a position.
+    """
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return build(trie)
+
+
+class InjuryTextAnalyzer:
+    """
+    Extracts injury type, severity, emergency flag and body area in one pass
+
+    All keyword tables are compiled once into a single Aho-Corasick
+    automaton (pyahocorasick) that reports every keyword occurrence in one
+    linear scan of the lowercased text. Without pyahocorasick the tables
+    are compiled into a trie-shaped regex instead: a zero-width lookahead
+    reports the longest keyword starting at every position, and each
+    keyword carries the results of the keywords that are prefixes of it,
+    so overlapping matches are not lost. Either way each field keeps its
+    best-ranked hit, which reproduces the priority order of the tables.
+    """
+
+    def __init__(
+        self,
+        injury_keywords: Dict[str, List[str]] = INJURY_KEYWORDS,
+        severity_keywords: Dict[str, List[str]] = SEVERITY_KEYWORDS,
+        body_areas: List[str] = BODY_AREAS,
+        emergency_keywords: List[str] = EMERGENCY_KEYWORDS,
+        whole_words: bool = False,
+        use_automaton: bool = True
+    ):
+        """
+        Initialize analyzer
+
+        Args:
+            injury_keywords: Injury category -> keywords, in priority order
+            severity_keywords: Severity level -> keywords, in priority order
+            body_areas: Body areas in priority order
+            emergency_keywords: Keywords that flag an emergency
+            whole_words: Only match keywords at word boundaries. Off by
+                default to keep the substring behaviour of the original
+                keyword scans ("hot" also matches "shot").
+            use_automaton: Use pyahocorasick when it is installed
+        """
+        self.whole_words = whole_words
+        self._injury_labels = list(injury_keywords)
+        self._severity_labels = list(severity_keywords)
+        self._body_labels = [area.capitalize() for area in body_areas]
+
+        ranks: Dict[str, Dict[str, int]] = {}
+
+        def add(keyword: str, field: str, rank: int):
+            fields = ranks.setdefault(keyword, {})
+            fields[field] = min(rank, fields.get(field, rank))
+
+        for rank, keywords in enumerate(injury_keywords.values()):
+            for keyword in keywords:
+                add(keyword, "injury_type", rank)
+        for rank, keywords in enumerate(severity_keywords.values()):
+            for keyword in keywords:
+                add(keyword, "severity", rank)
+        for rank, area in enumerate(body_areas):
+            add(area, "body_area", rank)
+        for keyword in emergency_keywords:
+            add(keyword, "is_emergency", 0)
+
+        # A match on a keyword implies a match on every keyword that is a
+        # prefix of it (and, for whole words, ends on a word boundary there)
+        self._outputs: Dict[str, List[tuple]] = {}
+        for keyword in ranks:
+            merged = dict(ranks[keyword])
+            for other, fields in ranks.items():
+                if other == keyword or not keyword.startswith(other):
+                    continue
+                if whole_words and _WORD_CHAR.match(keyword[len(other)]):
+                    continue
+                for field, rank in fields.items():
+                    merged[field] = min(rank, merged.get(field, rank))
+            self._outputs[keyword] = list(merged.items())
+
+        body = _trie_pattern(ranks)
+        if whole_words:
+            self._pattern = re.compile(r"(?=\b(" + body + r")\b)")
+        else:
+            self._pattern = re.compile("(?=(" + body + "))")
+
+        # The automaton reports overlapping matches itself, so it only
+        # needs each keyword's own ranks
+        self._automaton = None
+        if use_automaton and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, fields in ranks.items():
+                self._automaton.add_word(keyword, (len(keyword), list(fields.items())))
+            self._automaton.make_automaton()
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze an injury description
+
+        Args:
+            text: Transcribed or typed text
+
+        Returns:
+            Dictionary with injury_type, severity, is_emergency and body_area
+        """
+        best: Dict[str, int] = {}
+        if text and self._automaton is not None:
+            text_lower = text.lower()
+            for end, (length, fields) in self._automaton.iter(text_lower):
+                if self.whole_words and not _is_whole_word(text_lower, end + 1 - length, end + 1):
+                    continue
+                for field, rank in fields:
+                    if rank < best.get(field, rank + 1):
+                        best[field] = rank
+        elif text:
+            outputs = self._outputs
+            for match in self._pattern.finditer(text.lower()):
+                for field, rank in outputs[match.group(1)]:
+                    if rank < best.get(field, rank + 1):
+                        best[field] = rank
+
+        return {
+            "injury_type": (
+                self._injury_labels[best["injury_type"]]
+                if "injury_type" in best else DEFAULT_INJURY_TYPE
+            ),
+            "severity": (
+                self._severity_labels[best["severity"]]
+                if "severity" in best else DEFAULT_SEVERITY
+            ),
+            "is_emergency": "is_emergency" in best,
+            "body_area": self._body_labels[best["body_area"]] if "body_area" in best else None,
+        }
+
+
+INJURY_ANALYZER = InjuryTextAnalyzer()
+
+
+@lru_cache(maxsize=256)
+def _analyze_cached(text: str) -> tuple:
+    return tuple(INJURY_ANALYZER.analyze(text).items())
+
+
+def analyze_injury_text(text: str) -> Dict[str, Any]:
+    """
+    Analyze an injury description with the shared analyzer
+
+    Results are memoized per text, so Streamlit reruns over the same
+    transcription do not rescan it.
+
+    Args:
+        text: Transcribed or typed text
+
+    Returns:
+        Dictionary with injury_type, severity, is_emergency and body_area
+    """
+    return dict(_analyze_cached(text or ""))
@@ -0,0 +1,161 @@
+"""
+Streaming multipart/form-data encoder for uploads with progress reporting
+"""
+import io
+import mimetypes
+import os
+import uuid
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
+
+# Bytes read from a file per chunk
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _quote(value: str) -> str:
+    """Escape a header parameter value the way browsers do"""
+    return value.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+def _stream_length(stream: BinaryIO) -> int:
+    """Bytes remaining in a seekable stream"""
+    position = stream.tell()
+    end = stream.seek(0, io.SEEK_END)
+    stream.seek(position)
+    return end - position
+
+
+class MultipartEncoder(io.RawIOBase):
+    """
+    File-like multipart/form-data body read in bounded chunks
+
+    The body is described up front as a list of parts: encoded headers
+    as bytes and file contents as open streams. ``read`` walks the parts
+    and only ever holds one chunk, so memory does not grow with the file
+    size. ``__len__`` gives the exact body length, so requests sends a
+    Content-Length header instead of chunked encoding, and every read
+    reports (bytes sent, total bytes) to ``on_progress``.
+
+    Usage::
+
+        with open(path, "rb") as f:
+            body = MultipartEncoder({"file": ("photo.jpg", f, "image/jpeg")})
+            session.post(url, data=body, headers={"Content-Type": body.content_type})
+    """
+
+    def __init__(
+        self,
+        fields: dict,
+        on_progress: Optional[ProgressCallback] = None,
+        chunk_size: int = UPLOAD_CHUNK_SIZE
+    ):
+        """
+        Initialize encoder
+
+        Args:
+            fields: Field name -> str value, or (filename, stream or bytes[,
+                content_type]) for a file
+            on_progress: Called with (bytes sent, total bytes) after each read
+            chunk_size: Bytes yielded per iteration
+        """
+        super().__init__()
+        self.boundary = uuid.uuid4().hex
+        self.on_progress = on_progress
+        self.chunk_size = chunk_size
+        self._parts: List[Union[bytes, BinaryIO]] = []
+        self._length = 0
+        self._sent = 0
+
+        for name, value in fields.items():
+            if isinstance(value, tuple):
+                filename, content = value[0], value[1]
+                content_type = (
+                    value[2] if len(value) > 2
+                    else mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                )
+                header = (
+                    f'--{self.boundary}\r\n'
+                    f'Content-Disposition: form-data; name="{_quote(name)}"; filename="{_quote(filename)}"\r\n'
+                    f'Content-Type: {content_type}\r\n\r\n'
+                )
+                if isinstance(content, (bytes, bytearray, memoryview)):
+                    content = io.BytesIO(content)
+                self._add(header.encode("utf-8"))
+                self._add(content, _stream_length(content))
+                self._add(b"\r\n")
+            else:
+                self._add((
+                    f'--{self.boundary}\r\n'
+                    f'Content-Disposition: form-data; name="{_quote(name)}"\r\n\r\n'
+                    f'{value}\r\n'
+                ).encode("utf-8"))
+        self._add(f"--{self.boundary}--\r\n".encode("ascii"))
+
+    def _add(self, part: Union[bytes, BinaryIO], length: Optional[int] = None):
+        self._parts.append(part)
+        self._length += len(part) if length is None else length
+
+    @property
+    def content_type(self) -> str:
+        """Content-Type header value, including the boundary"""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        # requests subtracts this from __len__ to size the body
+        return self._sent
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        filled = 0
+        while filled < len(view) and self._parts:
+            part = self._parts[0]
+            if isinstance(part, bytes):
+                count = min(len(part), len(view) - filled)
+                view[filled:filled + count] = part[:count]
+                if count < len(part):
+                    self._parts[0] = part[count:]
+                else:
+                    self._parts.pop(0)
+            else:
+                count = part.readinto(view[filled:]) or 0
+                if count == 0:
+                    self._parts.pop(0)
+            filled += count
+
+        if filled:
+            self._sent += filled
+            if self.on_progress is not None:
+                self.on_progress(self._sent, self._length)
+        return filled
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def multipart_body(
+    fields: dict,
+    on_progress: Optional[ProgressCallback] = None
+) -> Tuple[MultipartEncoder, dict]:
+    """
+    Build a streaming multipart body and its request headers
+
+    Args:
+        fields: See ``MultipartEncoder``
+        on_progress: Called with (bytes sent, total bytes)
+
+    Returns:
+        Tuple of (encoder to pass as ``data``, headers dict)
+    """
+    encoder = MultipartEncoder(fields, on_progress=on_progress)
+    return encoder, {"Content-Type": encoder.content_type}
@@ -0,0 +1,225 @@
+"""
+Timeouts, retries and circuit breaking for backend API calls
+"""
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+# Seconds to wait for a TCP connection; kept short so a down backend fails fast
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3.05"))
+
+# Default seconds to wait for a response once connected
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "30"))
+
+# Extra attempts for idempotent requests after a connection error or 502/503/504.
+# Read timeouts are not retried: the backend already took a full timeout
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "2"))
+
+# Backoff before retry n is uniform in [0, min(cap, base * 2**n)] ("full jitter")
+API_BACKOFF_BASE = float(os.getenv("API_BACKOFF_BASE", "0.25"))
+API_BACKOFF_CAP = float(os.getenv("API_BACKOFF_CAP", "4"))
+
+# Consecutive failures that open the circuit, and seconds it stays open
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_COOLDOWN = float(os.getenv("CIRCUIT_COOLDOWN", "30"))
+
+# Methods that are safe to send again
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Responses that count as a backend failure
+FAILURE_STATUS_CODES = frozenset({500, 502, 503, 504})
+
+# Failure responses worth another attempt; a 500 is likely to repeat
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the circuit is open"""
+
+
+class ResiliencePolicy:
+    """
+    Shared timeout, retry and circuit breaker settings for one backend
+
+    The circuit opens after ``failure_threshold`` consecutive failures and
+    rejects requests with CircuitOpenError for ``cooldown`` seconds. After
+    that a single trial request is let through (half-open): success closes
+    the circuit, failure opens it for another cooldown. CircuitOpenError
+    subclasses ``requests.exceptions.ConnectionError``, so callers that
+    already handle connection errors degrade the same way, only faster.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = API_CONNECT_TIMEOUT,
+        read_timeout: float = API_READ_TIMEOUT,
+        max_retries: int = API_MAX_RETRIES,
+        backoff_base: float = API_BACKOFF_BASE,
+        backoff_cap: float = API_BACKOFF_CAP,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN
+    ):
+        """
+        Initialize policy
+
+        Args:
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Default seconds to wait for a response
+            max_retries: Extra attempts for idempotent requests
+            backoff_base: First retry's maximum backoff in seconds
+            backoff_cap: Largest backoff in seconds
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds the circuit stays open
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._counters = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "short_circuited": 0,
+            "opened": 0,
+        }
+
+    def timeouts(self, read_timeout: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Get a (connect, read) timeout pair for requests
+
+        Args:
+            read_timeout: Read timeout for this call; the default if None
+
+        Returns:
+            Tuple of (connect timeout, read timeout)
+        """
+        return (self.connect_timeout, self.read_timeout if read_timeout is None else read_timeout)
+
+    def attempts(self, method: str) -> int:
+        """Number of times a request with this method may be sent"""
+        return self.max_retries + 1 if method.upper() in IDEMPOTENT_METHODS else 1
+
+    def backoff(self, retry: int) -> float:
+        """Jittered delay in seconds before the given retry (0-based)"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** retry))
+
+    def before_request(self):
+        """
+        Let a request through or reject it while the circuit is open
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                trial request already in flight
+        """
+        with self._lock:
+            if self._state == OPEN:
+                remaining = self.cooldown - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    self._counters["short_circuited"] += 1
+                    raise CircuitOpenError(f"Backend unavailable; retrying in {remaining:.0f}s")
+                self._state = HALF_OPEN
+
+            if self._state == HALF_OPEN:
+                if self._trial_in_flight:
+                    self._counters["short_circuited"] += 1
+                    raise CircuitOpenError("Backend unavailable; recovery check in progress")
+                self._trial_in_flight = True
+
+            self._counters["requests"] += 1
+
+    def record_retry(self):
+        """Count a retry"""
+        with self._lock:
+            self._counters["retries"] += 1
+
+    def record_success(self):
+        """Close the circuit after a request the backend answered"""
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Count a failure and open the circuit once the threshold is reached"""
+        with self._lock:
+            self._counters["failures"] += 1
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._counters["opened"] += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def record_abandoned(self):
+        """
+        Settle a request that failed on the client side, such as an
+        unreadable upload or invalid arguments
+
+        The backend was never judged, so nothing is counted; a half-open
+        circuit stays half-open and lets the next request be the trial.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Circuit state: closed, open or half_open"""
+        with self._lock:
+            return self._state
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get circuit state and counters
+
+        Returns:
+            Dictionary with state, consecutive_failures, seconds until the
+            next trial (0 unless open) and request/retry/failure counters
+        """
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_in": retry_in,
+                **self._counters,
+            }
+
+
+_policies: Dict[str, ResiliencePolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def get_resilience_policy(base_url: str) -> ResiliencePolicy:
+    """
+    Get the process-wide resilience policy for a backend
+
+    Args:
+        base_url: Base URL of the backend API
+
+    Returns:
+        Shared ResiliencePolicy for that URL
+    """
+    with _policies_lock:
+        policy = _policies.get(base_url)
+        if policy is None:
+            policy = _policies[base_url] = ResiliencePolicy()
+    return policy
@@ -0,0 +1,213 @@
+"""
+Bounded on-disk store for uploaded files with LRU and age eviction
+"""
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from frontend.utils.cache import content_digest
+
+UPLOAD_STORE_PATH = os.getenv("UPLOAD_STORE_PATH", "temp")
+
+# Total bytes kept on disk; least recently used files go first (500 MB)
+UPLOAD_STORE_MAX_BYTES = int(os.getenv("UPLOAD_STORE_MAX_BYTES", str(500 * 1024 * 1024)))
+
+# Seconds an unused file is kept (6 hours)
+UPLOAD_STORE_MAX_AGE = float(os.getenv("UPLOAD_STORE_MAX_AGE", str(6 * 3600)))
+
+_PARTIAL_SUFFIX = ".part"
+
+
+class UploadStore:
+    """
+    Content-addressed upload directory with a size and age budget
+
+    Files live under ``<root>/<namespace>/<digest><ext>``, one namespace per
+    session. Writes go to a temporary file that is renamed into place. An
+    in-memory LRU of every stored file (rebuilt from disk on start) drives
+    eviction: files unused for ``max_age`` seconds are removed, then the
+    least recently used until the store is within ``max_bytes``. Namespace
+    directories are removed once their last file is gone.
+    """
+
+    def __init__(
+        self,
+        root: str = UPLOAD_STORE_PATH,
+        max_bytes: int = UPLOAD_STORE_MAX_BYTES,
+        max_age: float = UPLOAD_STORE_MAX_AGE
+    ):
+        """
+        Initialize the store and index files left by earlier runs
+
+        Args:
+            root: Directory holding the uploads
+            max_bytes: Maximum total size of stored files
+            max_age: Seconds an unused file is kept
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._writes = 0
+        self._hits = 0
+        self._evictions = 0
+
+        os.makedirs(root, exist_ok=True)
+        found = []
+        for directory, _, filenames in os.walk(root, topdown=False):
+            kept = 0
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    if filename.endswith(_PARTIAL_SUFFIX):
+                        os.remove(path)
+                        continue
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, path, stat.st_size))
+                kept += 1
+            if not kept:
+                self._remove_directory(directory)
+
+        for mtime, path, size in sorted(found):
+            self._entries[path] = (size, mtime)
+            self._bytes += size
+
+        with self._lock:
+            self._evict(time.time())
+
+    def put(self, namespace: str, data: bytes, extension: str = "") -> str:
+        """
+        Store bytes under their digest, writing only if not already present
+
+        Args:
+            namespace: Per-session directory name
+            data: File contents
+            extension: File extension including the dot
+
+        Returns:
+            Path of the stored file
+        """
+        directory = os.path.join(self.root, namespace)
+        path = os.path.join(directory, content_digest(data) + extension.lower())
+        now = time.time()
+
+        with self._lock:
+            if path in self._entries and os.path.exists(path):
+                self._entries[path] = (self._entries[path][0], now)
+                self._entries.move_to_end(path)
+                self._hits += 1
+                return path
+
+        # Created under the lock so eviction cannot remove the directory
+        # between makedirs and mkstemp
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            fd, partial_path = tempfile.mkstemp(dir=directory, suffix=_PARTIAL_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(partial_path, path)
+        except BaseException:
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._bytes -= previous[0]
+            self._entries[path] = (len(data), now)
+            self._bytes += len(data)
+            self._writes += 1
+            self._evict(now, keep=path)
+        return path
+
+    def touch(self, path: str) -> bool:
+        """
+        Mark a stored file as used
+
+        Args:
+            path: Path returned by put()
+
+        Returns:
+            True if the file is still held by the store
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or not os.path.exists(path):
+                return False
+            self._entries[path] = (entry[0], time.time())
+            self._entries.move_to_end(path)
+            return True
+
+    def _evict(self, now: float, keep: Optional[str] = None):
+        """Remove expired files, then least recently used ones over budget"""
+        for path, (size, used_at) in list(self._entries.items()):
+            over_age = now - used_at > self.max_age
+            if not over_age and self._bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self._remove(path, size)
+
+    def _remove(self, path: str, size: int):
+        del self._entries[path]
+        self._bytes -= size
+        self._evictions += 1
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        self._remove_directory(os.path.dirname(path))
+
+    def _remove_directory(self, directory: str):
+        """Remove a namespace directory once it holds no files"""
+        if os.path.abspath(directory) == os.path.abspath(self.root):
+            return
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get store counters
+
+        Returns:
+            Dictionary with files, bytes held, writes, hits and evictions
+        """
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "bytes": self._bytes,
+                "writes": self._writes,
+                "hits": self._hits,
+                "evictions": self._evictions,
+            }
+
+
+_upload_store: Optional[UploadStore] = None
+_upload_store_lock = threading.Lock()
+
+
+def get_upload_store() -> UploadStore:
+    """
+    Get the process-wide upload store, indexing it on first use
+
+    Returns:
+        Shared UploadStore instance
+    """
+    global _upload_store
+    with _upload_store_lock:
+        if _upload_store is None:
+            _upload_store = UploadStore()
+    return _upload_store